@@ -22,6 +22,8 @@ class Scaffolder:
         self.web_port = 5173
         self.db_port = 3306
         self.db_test_port = 3307  # Test database port (main port + 1)
+        self.db_profile = 'dev'  # MySQL tuning profile for the main database: dev, test or perf
+        self.db_memory_mb = 2048  # Memory set aside for MySQL (used to size buffers in the perf profile)
         self.uid = os.getuid()
         self.gid = os.getgid()
         
@@ -107,6 +109,29 @@ class Scaffolder:
             except ValueError:
                 pass
         
+        # Database performance profile
+        profiles = ('dev', 'test', 'perf')
+        while True:
+            profile_input = input(f"Database profile ({'/'.join(profiles)}) [{self.db_profile}]: ").strip().lower()
+            if not profile_input:
+                break
+            if profile_input in profiles:
+                self.db_profile = profile_input
+                break
+            print(f"Invalid profile. Choose one of: {', '.join(profiles)}.")
+        
+        if self.db_profile == 'perf':
+            # Default to half of the machine's memory, the rest is left for the other services
+            total_mb = self._detect_memory_mb()
+            if total_mb:
+                self.db_memory_mb = max(512, total_mb // 2)
+            memory_input = input(f"Memory for MySQL in MB [{self.db_memory_mb}]: ").strip()
+            if memory_input:
+                try:
+                    self.db_memory_mb = max(512, int(memory_input))
+                except ValueError:
+                    pass
+        
         # Derived names
         self.backend_name = "core"
         self.frontend_name = "web"
@@ -119,6 +144,10 @@ class Scaffolder:
         print(f"  Frontend: {self.frontend_name}")
         print(f"  Database: {self.db_name}")
         print(f"  Ports: API={self.api_port}, Web={self.web_port}, DB={self.db_port}, DB_TEST={self.db_test_port}")
+        if self.db_profile == 'perf':
+            print(f"  DB profile: {self.db_profile} ({self.db_memory_mb}MB, buffer pool {self._db_buffer_pool_mb()}MB)")
+        else:
+            print(f"  DB profile: {self.db_profile}")
         print()
         
         confirm = input("Proceed? [Y/n]: ").strip().lower()
@@ -254,6 +283,8 @@ class Scaffolder:
         self._create_gitignore()
         self._create_readme()
         self._create_publish_script()
+        self._create_setup_script()
+        self._create_mysql_config()
         print("  ✓ Main files created\n")
     
     def finalize(self):
@@ -282,9 +313,12 @@ class Scaffolder:
             'app/db',
             'app/services',
             'app/schemas',
+            'app/worker',
             'alembic/versions',
+            'benchmarks',
             'tests',
             'logs',
+            'wheelhouse',
         ]
         for d in dirs:
             Path(d).mkdir(parents=True, exist_ok=True)
@@ -298,10 +332,15 @@ class Scaffolder:
             'app/db/__init__.py',
             'app/services/__init__.py',
             'app/schemas/__init__.py',
+            'app/worker/__init__.py',
+            'benchmarks/__init__.py',
             'tests/__init__.py',
         ]:
             Path(init_file).touch()
         
+        # Keep the (initially empty) wheelhouse in git; the Dockerfile bind-mounts it
+        Path('wheelhouse/.gitkeep').touch()
+        
         # Copy and process template files
         backend_templates = [
             ('Dockerfile', 'Dockerfile'),
@@ -319,15 +358,52 @@ class Scaffolder:
             ('app/exceptions.py', 'app/exceptions.py'),
             ('app/service_init.py', 'app/service_init.py'),
             ('app/core/di.py', 'app/core/di.py'),
+            ('app/core/metrics.py', 'app/core/metrics.py'),
+            ('app/core/admission.py', 'app/core/admission.py'),
+            ('app/core/deadline.py', 'app/core/deadline.py'),
+            ('app/core/shm_cache.py', 'app/core/shm_cache.py'),
+            ('app/core/records.py', 'app/core/records.py'),
             ('app/db/session.py', 'app/db/session.py'),
             ('app/db/tables.py', 'app/db/tables.py'),
+            ('app/db/loader.py', 'app/db/loader.py'),
+            ('app/db/warmup.py', 'app/db/warmup.py'),
+            ('app/db/url.py', 'app/db/url.py'),
+            ('app/db/pagination.py', 'app/db/pagination.py'),
+            ('app/core/profiling.py', 'app/core/profiling.py'),
+            ('app/api/diagnostics_routes.py', 'app/api/diagnostics_routes.py'),
+            ('app/schemas/diagnostics_schema.py', 'app/schemas/diagnostics_schema.py'),
             ('app/services/utility_service.py', 'app/services/utility_service.py'),
+            ('app/services/job_service.py', 'app/services/job_service.py'),
             ('app/schemas/utility_schema.py', 'app/schemas/utility_schema.py'),
+            ('app/schemas/job_schema.py', 'app/schemas/job_schema.py'),
+            ('app/schemas/page_schema.py', 'app/schemas/page_schema.py'),
+            ('app/schemas/batch_schema.py', 'app/schemas/batch_schema.py'),
+            ('app/worker/queue.py', 'app/worker/queue.py'),
+            ('app/worker/runner.py', 'app/worker/runner.py'),
+            ('app/worker/tasks.py', 'app/worker/tasks.py'),
+            ('app/worker/__main__.py', 'app/worker/__main__.py'),
             ('app/api/v1/main_routes.py', 'app/api/v1/main_routes.py'),
+            ('app/api/system_routes.py', 'app/api/system_routes.py'),
+            ('app/api/batch_routes.py', 'app/api/batch_routes.py'),
             ('alembic/env.py', 'alembic/env.py'),
             ('alembic/script.py.mako', 'alembic/script.py.mako'),
+            ('alembic/versions/0001_create_jobs_table.py', 'alembic/versions/0001_create_jobs_table.py'),
+            ('alembic/versions/0002_add_jobs_created_at_index.py', 'alembic/versions/0002_add_jobs_created_at_index.py'),
+            ('benchmarks/bench_db_drivers.py', 'benchmarks/bench_db_drivers.py'),
+            ('benchmarks/bench_row_pipeline.py', 'benchmarks/bench_row_pipeline.py'),
             ('tests/conftest.py', 'tests/conftest.py'),
             ('tests/test_utility_service.py', 'tests/test_utility_service.py'),
+            ('tests/test_job_queue.py', 'tests/test_job_queue.py'),
+            ('tests/test_admission.py', 'tests/test_admission.py'),
+            ('tests/test_loader.py', 'tests/test_loader.py'),
+            ('tests/test_shm_cache.py', 'tests/test_shm_cache.py'),
+            ('tests/test_warmup.py', 'tests/test_warmup.py'),
+            ('tests/test_profiling.py', 'tests/test_profiling.py'),
+            ('tests/test_db_url.py', 'tests/test_db_url.py'),
+            ('tests/test_pagination.py', 'tests/test_pagination.py'),
+            ('tests/test_records.py', 'tests/test_records.py'),
+            ('tests/test_deadline.py', 'tests/test_deadline.py'),
+            ('tests/test_batch.py', 'tests/test_batch.py'),
         ]
         
         for template_rel, output_rel in backend_templates:
@@ -347,6 +423,7 @@ class Scaffolder:
             'src/composables',
             'src/utils',
             'public',
+            'scripts',
         ]
         for d in dirs:
             Path(d).mkdir(parents=True, exist_ok=True)
@@ -358,12 +435,16 @@ class Scaffolder:
             ('vite.config.js', 'vite.config.js'),
             ('entrypoint.sh', 'entrypoint.sh'),
             ('.gitignore', '.gitignore'),
+            ('.dockerignore', '.dockerignore'),
+            ('server.js', 'server.js'),
+            ('scripts/precompress.js', 'scripts/precompress.js'),
             ('index.html', 'index.html'),
             ('src/main.js', 'src/main.js'),
             ('src/App.vue', 'src/App.vue'),
             ('src/config.js', 'src/config.js'),
             ('src/router/index.js', 'src/router/index.js'),
             ('src/services/api.js', 'src/services/api.js'),
+            ('src/composables/useApi.js', 'src/composables/useApi.js'),
             ('src/views/HomeView.vue', 'src/views/HomeView.vue'),
         ]
         
@@ -393,6 +474,7 @@ DB_PORT={self.db_port}
 DB_TEST_PORT={self.db_test_port}
 UID={self.uid}
 GID={self.gid}
+COMPOSE_PROFILES=worker
 """
         Path('.env.example').write_text(env_content)
     
@@ -410,6 +492,32 @@ GID={self.gid}
         # Make it executable
         os.chmod('publish-to-github.sh', 0o755)
     
+    def _create_mysql_config(self):
+        """Create MySQL config overrides for the selected profile"""
+        # The main database uses the selected profile, the test database always uses the test profile
+        self._process_template(f'main/mysql/{self.db_profile}.cnf', 'mysql/database.cnf')
+        self._process_template('main/mysql/test.cnf', 'mysql/database-test.cnf')
+        # MySQL ignores world-writable config files
+        os.chmod('mysql/database.cnf', 0o644)
+        os.chmod('mysql/database-test.cnf', 0o644)
+    
+    def _detect_memory_mb(self):
+        """Total physical memory in MB, or None if it can't be determined"""
+        try:
+            return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1024 * 1024)
+        except (ValueError, OSError, AttributeError):
+            return None
+    
+    def _db_buffer_pool_mb(self):
+        """InnoDB buffer pool: 3/4 of the MySQL memory budget, in 128MB chunks"""
+        return max(128, (self.db_memory_mb * 3 // 4) // 128 * 128)
+    
+    def _create_setup_script(self):
+        """Create setup.sh script used by `make setup`"""
+        self._process_template('main/setup.sh', 'setup.sh')
+        # Make it executable
+        os.chmod('setup.sh', 0o755)
+    
     def _process_template(self, template_path, output_path):
         """Process a template file with variable substitution"""
         template_file = self.templates_dir / template_path
@@ -422,6 +530,7 @@ GID={self.gid}
         template_content = template_file.read_text()
         
         # Substitute variables
+        buffer_pool_mb = self._db_buffer_pool_mb()
         template = Template(template_content)
         content = template.safe_substitute(
             PROJECT_NAME=self.project_name,
@@ -432,6 +541,11 @@ GID={self.gid}
             WEB_PORT=self.web_port,
             DB_PORT=self.db_port,
             DB_TEST_PORT=self.db_test_port,
+            DB_PROFILE=self.db_profile,
+            DB_MEMORY_MB=self.db_memory_mb,
+            DB_BUFFER_POOL_MB=buffer_pool_mb,
+            DB_BUFFER_POOL_INSTANCES=max(1, min(8, buffer_pool_mb // 1024)),
+            DB_REDO_LOG_MB=min(8192, max(512, buffer_pool_mb // 4)),
             UID=self.uid,
             GID=self.gid,
         )
@@ -0,0 +1,23 @@
+"""add jobs created_at index for keyset pagination
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_jobs_created_at_id', 'jobs', ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_created_at_id', table_name='jobs')
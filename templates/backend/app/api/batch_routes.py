@@ -0,0 +1,97 @@
+import asyncio
+from typing import Any, Dict, List, Tuple
+from urllib.parse import unquote, urlsplit
+import orjson
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+from app.config import settings
+from app.log_setup import get_app_logger
+from app.schemas.batch_schema import BatchRequest, BatchResponse
+
+router = APIRouter(prefix="/api")
+
+BATCH_PATH = "/api/batch"
+# Headers of the batch request that don't apply to the individual GETs
+_DROPPED_HEADERS = {b"content-length", b"content-type", b"accept-encoding", b"transfer-encoding"}
+# Connection-level scope keys shared with the items; routing state of the batch request is not
+_CONNECTION_KEYS = ("type", "asgi", "http_version", "scheme", "server", "client", "root_path")
+
+
+def _route_path(path: str) -> str:
+    """The path an item is routed on: its path component, percent-decoded."""
+    return unquote(urlsplit(path).path)
+
+
+async def _dispatch(request: Request, path: str) -> Tuple[int, Any]:
+    """
+    Run one GET through the whole app in-process and capture its response. Going through the
+    middleware stack gives each item its own admission slot, deadline and error handling.
+    """
+    url = urlsplit(path)
+    scope: Dict[str, Any] = {k: request.scope[k] for k in _CONNECTION_KEYS if k in request.scope}
+    scope.update(
+        method="GET",
+        path=_route_path(path),
+        raw_path=url.path.encode(),
+        query_string=url.query.encode(),
+        headers=[(k, v) for k, v in request.scope["headers"] if k not in _DROPPED_HEADERS],
+        state=dict(request.scope.get("state", {})),
+    )
+
+    status = 500
+    content_type = b""
+    chunks: List[bytes] = []
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status, content_type
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await request.app(scope, receive, send)
+    body = b"".join(chunks)
+    if not body:
+        return status, None
+    if content_type.startswith(b"application/json"):
+        return status, orjson.Fragment(body)  # already JSON: embed as-is
+    return status, body.decode(errors="replace")
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def batch(payload: BatchRequest, request: Request):
+    """
+    Run several GET requests in one round trip.
+    This endpoint demonstrates:
+    - Collapsing client fan-out reads into one HTTP request (see batch() in api.js)
+    - In-process dispatch through the app: each item runs its middleware (admission control,
+      deadline), route, dependencies and error handling exactly as a standalone GET would
+    """
+    if len(payload.requests) > settings.batch_max_requests:
+        raise HTTPException(status_code=400, detail=f"At most {settings.batch_max_requests} requests per batch")
+    for item in payload.requests:
+        # Checked on the decoded path the item is dispatched on, so %-escapes can't get around it
+        route_path = _route_path(item.path)
+        if not route_path.startswith("/api/") or route_path.rstrip("/") == BATCH_PATH:
+            raise HTTPException(status_code=400, detail=f"Cannot batch '{item.path}'")
+
+    # Items are admitted one by one like standalone requests; this only bounds one batch's share
+    limit = asyncio.Semaphore(settings.batch_concurrency)
+
+    async def run(path: str) -> Dict[str, Any]:
+        # A failing item must not fail the batch: report it the way the server would have
+        try:
+            async with limit:
+                status, body = await _dispatch(request, path)
+        except Exception:
+            # The app has already answered 500; this is the error middleware's re-raise
+            get_app_logger().exception(f"Batched request {path} failed")
+            return {"status": 500, "body": {"detail": "Internal Server Error"}}
+        return {"status": status, "body": body}
+
+    responses = await asyncio.gather(*(run(item.path) for item in payload.requests))
+    return Response(orjson.dumps({"responses": responses}), media_type="application/json")
@@ -0,0 +1,83 @@
+import hmac
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.config import settings
+from app.core.profiling import dump_tasks, profiler
+from app.db.session import engine
+from app.exceptions import ProfilerBusyError
+from app.schemas.diagnostics_schema import ProfileRequest
+
+
+def require_diagnostics_token(x_diagnostics_token: Optional[str] = Header(None)) -> None:
+    """Only callers presenting DIAGNOSTICS_TOKEN may use these endpoints."""
+    if not settings.diagnostics_token or not hmac.compare_digest(
+        (x_diagnostics_token or "").encode(), settings.diagnostics_token.encode()
+    ):
+        raise HTTPException(status_code=404)
+
+
+# Internal diagnostics, only mounted when DIAGNOSTICS_TOKEN is set
+router = APIRouter(
+    prefix="/diagnostics",
+    include_in_schema=False,
+    dependencies=[Depends(require_diagnostics_token)],
+)
+
+
+@router.post("/profile", status_code=202)
+async def start_profile(request: ProfileRequest):
+    """
+    Start sampling this process's stacks.
+    This endpoint demonstrates:
+    - Profiling for a fixed time, or for the next N requests under a path prefix
+    - Optional per-statement SQL timing, attached only for the session
+    """
+    try:
+        session = profiler.start(
+            seconds=request.seconds,
+            requests=request.requests,
+            path=request.path,
+            interval=request.interval_ms / 1000,
+            engine=engine.sync_engine if request.sql else None,
+        )
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return session.status()
+
+
+@router.post("/profile/stop")
+async def stop_profile():
+    """Stop the running session early; its results stay available."""
+    session = profiler.stop()
+    if session is None:
+        raise HTTPException(status_code=404, detail="No profiling session")
+    return session.status()
+
+
+@router.get("/profile")
+async def get_profile(format: str = "collapsed"):
+    """
+    Results of the current or last session.
+    - `format=collapsed`: folded stacks for flamegraph.pl / inferno
+    - `format=speedscope`: JSON for https://www.speedscope.app
+    - `format=sql`: per-statement timing, slowest total first
+    """
+    session = profiler.session
+    if session is None:
+        raise HTTPException(status_code=404, detail="No profiling session")
+    if session.running:
+        return JSONResponse(session.status(), status_code=202)
+    if format == "collapsed":
+        return PlainTextResponse(session.sampler.collapsed())
+    if format == "speedscope":
+        return session.sampler.speedscope(name=f"{settings.project_name} profile {session.id}")
+    if format == "sql":
+        return {**session.status(), "statements": session.sql.report() if session.sql else []}
+    raise HTTPException(status_code=400, detail="format must be collapsed, speedscope or sql")
+
+
+@router.get("/tasks")
+async def get_tasks(limit: int = 20):
+    """Every asyncio task of this process and the frames it is suspended in."""
+    return dump_tasks(limit=limit)
@@ -0,0 +1,27 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.core.metrics import metrics
+from app.db.warmup import readiness
+
+# Operational endpoints, served outside the /api prefix
+router = APIRouter(include_in_schema=False)
+
+
+@router.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+async def readyz():
+    """Readiness: succeeds only once the db pool warm-up has finished."""
+    if not readiness.ready:
+        return JSONResponse({"status": "warming_up", "error": readiness.error}, status_code=503)
+    return {"status": "ready", "warmed_connections": readiness.warmed_connections}
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Process metrics in the Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -1,7 +1,14 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.exceptions import InvalidInputError
 from app.services.utility_service import UtilityService
-from app.service_init import get_utility_service
+from app.services.job_service import JOB_RECORDS, JobService
+from app.service_init import get_utility_service, get_job_queue, get_job_service
 from app.schemas.utility_schema import DatabaseVersionResponse
+from app.schemas.job_schema import JobEnqueuedResponse, JobResponse
+from app.schemas.page_schema import Page
+from app.worker.queue import JobQueue
 from app.log_setup import get_app_logger
 import logging
 
@@ -24,3 +31,39 @@ async def get_db_version(
     logger.info(f"Database version requested: {version}")
     return DatabaseVersionResponse(version=version)
 
+
+
+@router.post("/dbversion/refresh", response_model=JobEnqueuedResponse, status_code=202)
+async def refresh_db_version(
+    job_queue: JobQueue = Depends(get_job_queue),
+    logger: logging.Logger = Depends(get_app_logger)
+):
+    """
+    Queue a background lookup of the database version.
+    This endpoint demonstrates:
+    - Moving work off the request path onto the worker
+    - Responding immediately with 202 Accepted and the job id
+    """
+    job = await job_queue.enqueue("log_database_version", {"requested_by": "api"})
+    logger.info(f"Queued job {job.id} ({job.kind})")
+    return JobEnqueuedResponse(job_id=job.id)
+
+
+@router.get("/jobs", response_model=Page[JobResponse])
+async def list_jobs(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    job_service: JobService = Depends(get_job_service),
+):
+    """
+    List background jobs, newest first.
+    This endpoint demonstrates:
+    - Cursor (keyset) pagination: pass `next_cursor` back as `cursor` until it is null
+    - Generic Pydantic page schemas, used for the docs only
+    - Serializing rows directly (RecordType) instead of building a model per row
+    """
+    try:
+        page = await job_service.list_jobs(limit=limit, cursor=cursor)
+    except InvalidInputError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return JOB_RECORDS.page_response(page.rows, page.next_cursor)
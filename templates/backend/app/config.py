@@ -1,3 +1,4 @@
+from typing import Dict, List
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,6 +13,60 @@ class Settings(BaseSettings):
     log_level: str = "DEBUG"
     version: str = "1.0.0"
 
+    # Async MySQL driver: aiomysql or asyncmy; empty keeps the one in DATABASE_URL
+    db_driver: str = ""
+
+    # Database connection pool
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_warmup_connections: int = 5  # opened at startup, capped at db_pool_size
+    db_warmup_timeout: float = 30.0
+
+    # Admission control: per route class in-flight limits with a bounded wait queue
+    admission_enabled: bool = True
+    admission_max_inflight: int = 0  # total over all route classes; 0 means the pool capacity (size + overflow)
+    admission_limits: Dict[str, int] = {}  # route class -> in-flight limit; other classes share the rest
+    admission_route_classes: Dict[str, str] = {}  # path prefix -> route class
+    admission_max_queue: int = 100
+    admission_queue_timeout: float = 5.0
+    admission_retry_after: int = 1
+    # Also exempt from request deadlines
+    admission_exempt_paths: List[str] = ["/healthz", "/readyz", "/metrics", "/diagnostics", "/docs", "/redoc", "/openapi.json"]
+    request_timeout_header: str = "X-Request-Timeout"  # client deadline, in seconds
+
+    # Request deadlines: 504 past the timeout; running statements are stopped with KILL QUERY first
+    request_timeout_default: float = 30.0  # seconds, 0 = no deadline
+    request_timeouts: Dict[str, float] = {}  # path prefix -> seconds
+    request_timeout_kill_grace: float = 1.0  # wait after KILL QUERY before cancelling the handler
+
+    # Diagnostics (profiling, task dumps, SQL timing) under /diagnostics; disabled while empty.
+    # Callers must send the token in the X-Diagnostics-Token header.
+    diagnostics_token: str = ""
+
+    # POST /api/batch: several GETs in one round trip
+    batch_max_requests: int = 20
+    batch_concurrency: int = 4  # items of one batch running at once; each also takes an admission slot
+
+    # Response compression: gzip bodies of at least this many bytes for clients that accept it
+    gzip_enabled: bool = True
+    gzip_minimum_size: int = 1000
+    gzip_compresslevel: int = 6  # 1 (fastest) .. 9 (smallest)
+
+    # Cache shared by all worker processes of a container (memory-mapped file)
+    shm_cache_path: str = ""  # empty: /dev/shm/<project_name>-cache
+    shm_cache_slots: int = 4096
+    shm_cache_slot_size: int = 4096  # bytes per entry, key and value included
+    shm_cache_ways: int = 8
+
+    # Background jobs: "mysql" (jobs table, separate worker service) or "memory" (in-process, inside the API)
+    worker_backend: str = "mysql"
+    worker_concurrency: int = 4
+    worker_poll_interval: float = 1.0
+    worker_max_attempts: int = 5
+    worker_retry_delay: float = 2.0  # doubled on every attempt
+    worker_job_timeout: float = 300.0
+
 
 settings = Settings()  # type: ignore
 
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Deque, Dict, Iterable, Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.metrics import metrics
+
+# Route class of the request being handled; used to label db pool checkout waits
+route_class_var: ContextVar[str] = ContextVar("route_class", default="none")
+# Seconds the request being handled spent in the admission queue
+admission_wait_var: ContextVar[float] = ContextVar("admission_wait", default=0.0)
+
+
+class AdmissionGate:
+    """
+    Concurrency limit for one route class, with a bounded FIFO queue in front of it.
+
+    A released slot is handed directly to the oldest waiter, so queued requests are
+    admitted in arrival order and in-flight never exceeds the limit.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int) -> None:
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.inflight = 0
+        self.avg_wait = 0.0  # moving average of queue wait, in seconds
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, timeout: float) -> Optional[str]:
+        """Take a slot, waiting up to timeout seconds. Returns None when admitted, else the rejection reason."""
+        if self.inflight < self.limit and not self._waiters:
+            self.inflight += 1
+            return None
+        if len(self._waiters) >= self.max_queue:
+            return "queue_full"
+        if timeout <= 0 or (self.avg_wait > timeout and self._waiters):
+            # Can't be served before the caller's deadline; fail fast instead of queueing
+            return "deadline"
+
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        started = time.monotonic()
+        try:
+            await asyncio.wait({fut}, timeout=timeout)
+        except asyncio.CancelledError:
+            self._abandon(fut)
+            raise
+        waited = time.monotonic() - started
+        self.avg_wait = 0.8 * self.avg_wait + 0.2 * waited
+        if not fut.done():
+            self._abandon(fut)
+            return "timeout"
+
+        metrics.observe("admission_queue_wait_seconds", waited, route_class=self.name)
+        return None
+
+    def release(self) -> None:
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                # Hand the slot over; inflight stays the same
+                fut.set_result(None)
+                return
+        self.inflight -= 1
+
+    def _abandon(self, fut: asyncio.Future) -> None:
+        if fut.done() and not fut.cancelled():
+            # The slot was handed to us just as we gave up: pass it on
+            self.release()
+            return
+        fut.cancel()
+        try:
+            self._waiters.remove(fut)
+        except ValueError:
+            pass
+
+
+def split_capacity(capacity: int, names: Iterable[str], limits: Dict[str, int]) -> Dict[str, int]:
+    """
+    In-flight limit per route class: explicit `limits` as given, the remaining capacity split
+    evenly over the other classes. Raises ValueError when the limits can't fit in `capacity`.
+    """
+    rest = sorted(set(names) - limits.keys())
+    left = capacity - sum(limits.values())
+    if left < len(rest) or (not rest and left < 0):
+        raise ValueError(
+            f"Admission limits {limits} leave {left} of {capacity} slots for route classes {rest}; "
+            "they must add up to at most the pool capacity, with at least 1 slot per class"
+        )
+    split = dict(limits)
+    for i, name in enumerate(rest):
+        # Spread the remainder over the first classes (sorted by name, so it's deterministic)
+        split[name] = left // len(rest) + (1 if i < left % len(rest) else 0)
+    return split
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware that sheds load instead of letting requests pile up on the db pool.
+
+    - Requests are grouped into route classes by path prefix, each with its own in-flight limit.
+      Together the limits never exceed `capacity` (the db pool): classes without an explicit limit
+      share what the explicit limits leave, and limits adding up to more raise ValueError.
+    - Beyond the limit requests wait in a bounded queue, for at most queue_timeout or the
+      client's own deadline (deadline_header, in seconds), whichever is shorter.
+    - Requests that can't be admitted get 503 with a Retry-After header.
+    """
+
+    def __init__(self,
+                 app: ASGIApp,
+                 *,
+                 capacity: int,
+                 limits: Optional[Dict[str, int]] = None,
+                 route_classes: Optional[Dict[str, str]] = None,
+                 max_queue: int = 100,
+                 queue_timeout: float = 5.0,
+                 retry_after: int = 1,
+                 deadline_header: str = "X-Request-Timeout",
+                 exempt_paths: Iterable[str] = ()) -> None:
+        self.app = app
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.deadline_header = deadline_header.lower().encode("latin-1")
+        self.exempt_paths = tuple(exempt_paths)
+        # Longest prefix wins
+        self.route_classes = sorted((route_classes or {}).items(), key=lambda kv: len(kv[0]), reverse=True)
+
+        names = {"default", *(limits or {}).keys(), *(cls for _, cls in self.route_classes)}
+        self.gates: Dict[str, AdmissionGate] = {
+            name: AdmissionGate(name, limit, max_queue)
+            for name, limit in split_capacity(capacity, names, limits or {}).items()
+        }
+        metrics.register_collector(self._collect)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or scope["path"].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        route_class = self.classify(scope["path"])
+        gate = self.gates[route_class]
+
+        started = time.monotonic()
+        rejected = await gate.acquire(self._wait_budget(scope))
+        if rejected:
+            metrics.inc("admission_rejected_total", route_class=route_class, reason=rejected)
+            retry_after = max(self.retry_after, math.ceil(gate.avg_wait))
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry"},
+                status_code=503,
+                headers={"Retry-After": str(retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        metrics.inc("admission_admitted_total", route_class=route_class)
+        token = route_class_var.set(route_class)
+        wait_token = admission_wait_var.set(time.monotonic() - started)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission_wait_var.reset(wait_token)
+            route_class_var.reset(token)
+            gate.release()
+
+    def classify(self, path: str) -> str:
+        for prefix, route_class in self.route_classes:
+            if path.startswith(prefix):
+                return route_class
+        return "default"
+
+    def _wait_budget(self, scope: Scope) -> float:
+        for name, value in scope["headers"]:
+            if name == self.deadline_header:
+                try:
+                    return min(self.queue_timeout, float(value))
+                except ValueError:
+                    break
+        return self.queue_timeout
+
+    def _collect(self, m) -> None:
+        for name, gate in self.gates.items():
+            m.set("admission_inflight", gate.inflight, route_class=name)
+            m.set("admission_queued", gate.queued, route_class=name)
+            m.set("admission_limit", gate.limit, route_class=name)
+            m.set("admission_queue_wait_avg_seconds", gate.avg_wait, route_class=name)
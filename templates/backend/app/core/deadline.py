@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, Iterable, Iterator, Mapping, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.admission import admission_wait_var
+from app.core.metrics import metrics
+
+# Absolute deadline (time.monotonic()) of the work in progress, None when unbounded
+deadline_var: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+# Statements of the request currently executing, MySQL connection id -> statement tag, for KILL QUERY
+_statements_var: ContextVar[Optional[Dict[int, Optional[str]]]] = ContextVar("deadline_statements", default=None)
+_tags = itertools.count(1)
+
+# Statement stopped by MAX_EXECUTION_TIME (3024) or by KILL QUERY (1317)
+_TIMEOUT_ERRORS = (3024, 1317)
+
+KillQueries = Callable[[Mapping[int, Optional[str]]], Awaitable[int]]
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None without one."""
+    deadline_at = deadline_var.get()
+    return None if deadline_at is None else deadline_at - time.monotonic()
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Tighten the deadline for a block, e.g. a query that must not use up the whole request budget."""
+    deadline_at = time.monotonic() + seconds
+    current = deadline_var.get()
+    token = deadline_var.set(deadline_at if current is None else min(current, deadline_at))
+    try:
+        yield
+    finally:
+        deadline_var.reset(token)
+
+
+def is_statement_timeout(exc: BaseException) -> bool:
+    orig = getattr(exc, "orig", exc)
+    args = getattr(orig, "args", ())
+    return bool(args) and args[0] in _TIMEOUT_ERRORS
+
+
+def _thread_id(conn) -> Optional[int]:
+    # Cached on the DBAPI connection; aiomysql and asyncmy both keep the server's connection id
+    info = conn.info
+    if "mysql_thread_id" not in info:
+        server_thread_id = getattr(conn.connection.driver_connection, "server_thread_id", None)
+        info["mysql_thread_id"] = server_thread_id[0] if server_thread_id else None
+    return info["mysql_thread_id"]
+
+
+def install_statement_deadlines(engine: Engine) -> None:
+    """
+    Propagate the current deadline to MySQL:
+    - SELECTs get a /*+ MAX_EXECUTION_TIME(ms) */ hint with the time left, so the server stops them
+    - Executing statements are tracked per request so DeadlineMiddleware can KILL QUERY them, and
+      tagged with a trailing /* deadline-N */ comment so the kill can check in the process list
+      that the connection is still running that very statement
+    Statements run without a deadline are left untouched.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute", retval=True)
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        deadline_at = deadline_var.get()
+        if deadline_at is None:
+            return statement, parameters
+        stripped = statement.lstrip()
+        if stripped[:6].upper() == "SELECT":
+            ms = max(1, int((deadline_at - time.monotonic()) * 1000))
+            statement = f"SELECT /*+ MAX_EXECUTION_TIME({ms}) */{stripped[6:]}"
+        statements = _statements_var.get()
+        if statements is not None:
+            thread_id = _thread_id(conn)
+            if thread_id is not None:
+                # executemany INSERTs are left as is: the driver only batches statements it can parse
+                tag = None if executemany else f"deadline-{next(_tags)}"
+                if tag is not None:
+                    statement = f"{statement} /* {tag} */"
+                statements[thread_id] = tag
+        return statement, parameters
+
+    def _done(conn) -> None:
+        statements = _statements_var.get()
+        if statements:
+            statements.pop(conn.info.get("mysql_thread_id"), None)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        _done(conn)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        if exception_context.connection is not None:
+            _done(exception_context.connection)
+
+
+class DeadlineMiddleware:
+    """
+    ASGI middleware giving every request a deadline and answering 504 when it passes.
+
+    - The timeout comes from the longest matching path prefix in `timeouts`, else `default_timeout`
+      (0 = none); a client can only shorten it with the deadline header (in seconds). The header
+      budget is end to end, so the time spent in the admission queue is taken off it.
+    - At the deadline, statements the request is running are stopped with KILL QUERY from a
+      separate connection. The handler then sees a MySQL error instead of a cancellation, so its
+      connection goes back to the pool in a clean state. Only if it is still running `kill_grace`
+      seconds later is the handler cancelled.
+    """
+
+    def __init__(self,
+                 app: ASGIApp,
+                 *,
+                 default_timeout: float,
+                 timeouts: Optional[Dict[str, float]] = None,
+                 header: str = "X-Request-Timeout",
+                 kill_queries: Optional[KillQueries] = None,
+                 kill_grace: float = 1.0,
+                 exempt_paths: Iterable[str] = ()) -> None:
+        self.app = app
+        self.default_timeout = default_timeout
+        # Longest prefix wins
+        self.timeouts = sorted((timeouts or {}).items(), key=lambda kv: len(kv[0]), reverse=True)
+        self.header = header.lower().encode("latin-1")
+        self.kill_queries = kill_queries
+        self.kill_grace = kill_grace
+        self.exempt_paths = tuple(exempt_paths)
+        self._kills: Set[asyncio.Task] = set()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+        route, timeout = self._timeout_for(scope)
+        if not timeout:
+            await self.app(scope, receive, send)
+            return
+
+        loop = asyncio.get_running_loop()
+        statements: Dict[int, Optional[str]] = {}
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        deadline_token = deadline_var.set(time.monotonic() + timeout)
+        statements_token = _statements_var.set(statements)
+        try:
+            async with asyncio.timeout(None) as cancel_scope:
+                def on_deadline() -> None:
+                    if statements and self.kill_queries is not None:
+                        # The live mapping: statements finishing before the kill must not be killed
+                        self._start_kill(statements)
+                        cancel_scope.reschedule(loop.time() + self.kill_grace)
+                    else:
+                        cancel_scope.reschedule(loop.time())
+
+                handle = loop.call_later(timeout, on_deadline)
+                try:
+                    await self.app(scope, receive, send_wrapper)
+                finally:
+                    handle.cancel()
+            return
+        except TimeoutError:
+            pass
+        except Exception as e:
+            if not is_statement_timeout(e):
+                raise
+        finally:
+            _statements_var.reset(statements_token)
+            deadline_var.reset(deadline_token)
+
+        metrics.inc("request_timeouts_total", route=route)
+        if not response_started:
+            response = JSONResponse({"detail": "Request timed out"}, status_code=504)
+            await response(scope, receive, send)
+
+    def _timeout_for(self, scope: Scope) -> Tuple[str, float]:
+        route, timeout = "default", self.default_timeout
+        for prefix, seconds in self.timeouts:
+            if scope["path"].startswith(prefix):
+                route, timeout = prefix, seconds
+                break
+        for name, value in scope["headers"]:
+            if name == self.header:
+                try:
+                    requested = float(value)
+                except ValueError:
+                    break
+                if requested > 0:
+                    requested = max(requested - admission_wait_var.get(), 0.001)
+                    timeout = min(timeout, requested) if timeout else requested
+                break
+        return route, timeout
+
+    def _start_kill(self, statements: Mapping[int, Optional[str]]) -> None:
+        # Runs outside the request task, so cancelling the handler doesn't abort the kill
+        task = asyncio.ensure_future(self._kill(statements))
+        self._kills.add(task)
+        task.add_done_callback(self._kills.discard)
+
+    async def _kill(self, statements: Mapping[int, Optional[str]]) -> None:
+        try:
+            killed = await self.kill_queries(statements)
+        except Exception:
+            metrics.inc("statement_kill_errors_total")
+            return
+        metrics.inc("statement_kills_total", killed)
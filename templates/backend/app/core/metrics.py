@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, Dict, List, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _fmt_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    inner = ",".join(f'{k}="{v}"' for k, v in key)
+    return "{" + inner + "}"
+
+
+class Metrics:
+    """
+    Minimal in-process metrics registry rendered in the Prometheus text format.
+
+    - Counters only go up (inc), gauges are set (set) or computed at scrape time (collector).
+    - observe() keeps count/sum/max, enough for rates and averages without histograms.
+    - Values are per process; with several uvicorn workers each one reports its own.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._summaries: Dict[str, Dict[LabelKey, List[float]]] = {}
+        self._collectors: List[Callable[["Metrics"], None]] = []
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        key = _key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        with self._lock:
+            self._gauges.setdefault(name, {})[_key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = _key(labels)
+        with self._lock:
+            series = self._summaries.setdefault(name, {})
+            stats = series.get(key)
+            if stats is None:
+                series[key] = [1, value, value]
+            else:
+                stats[0] += 1
+                stats[1] += value
+                stats[2] = max(stats[2], value)
+
+    def counter_value(self, name: str, **labels: str) -> float:
+        return self._counters.get(name, {}).get(_key(labels), 0.0)
+
+    def register_collector(self, collector: Callable[["Metrics"], None]) -> None:
+        """Register a callback that refreshes gauges right before each scrape."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector(self)
+
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                lines.extend(f"{name}{_fmt_labels(k)} {v:g}" for k, v in sorted(series.items()))
+            for name, series in sorted(self._gauges.items()):
+                lines.append(f"# TYPE {name} gauge")
+                lines.extend(f"{name}{_fmt_labels(k)} {v:g}" for k, v in sorted(series.items()))
+            for name, series in sorted(self._summaries.items()):
+                lines.append(f"# TYPE {name} summary")
+                for k, (count, total, peak) in sorted(series.items()):
+                    lines.append(f"{name}_count{_fmt_labels(k)} {count:g}")
+                    lines.append(f"{name}_sum{_fmt_labels(k)} {total:g}")
+                    lines.append(f"{name}_max{_fmt_labels(k)} {peak:g}")
+        return "\n".join(lines) + "\n"
+
+
+# Global registry
+metrics = Metrics()
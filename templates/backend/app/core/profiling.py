@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.exceptions import ProfilerBusyError
+
+Stack = Tuple[str, ...]
+
+_SQL_WHITESPACE = re.compile(r"\s+")
+
+
+def _short_path(filename: str) -> str:
+    # Strip the longest sys.path entry so frames read app/services/x.py or sqlalchemy/engine/base.py
+    best = ""
+    for entry in sys.path:
+        if entry and filename.startswith(entry) and len(entry) > len(best):
+            best = entry
+    return filename[len(best):].lstrip(os.sep) if best else filename
+
+
+class StackSampler:
+    """
+    Samples the Python stacks of all threads from a background thread via sys._current_frames().
+
+    No tracing hooks are installed, so the profiled code runs at full speed; the cost is one
+    stack walk per thread every `interval` seconds. Identical stacks are aggregated as they come in.
+    """
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 128) -> None:
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks: Counter[Stack] = Counter()
+        self.samples = 0
+        self.paused = False
+        self.duration = 0.0
+        self._labels: Dict[Any, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = 0.0
+
+    def start(self) -> None:
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="diagnostics-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.monotonic() - self._started_at
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names: Dict[int, str] = {}
+        while not self._stop.wait(self.interval):
+            if self.paused:
+                continue
+            if self.samples % 100 == 0:
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack: List[str] = []
+                while frame is not None and len(stack) < self.max_depth:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                stack.reverse()
+                self.stacks[tuple(stack)] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed format (thread;outer;...;inner count), for flamegraph.pl and friends."""
+        lines = [f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common()]
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name: str = "profile") -> Dict[str, Any]:
+        """Sampled profile in the speedscope file format, one profile per thread."""
+        frames: List[Dict[str, Any]] = []
+        frame_index: Dict[str, int] = {}
+        per_thread: Dict[str, Tuple[List[List[int]], List[float]]] = {}
+
+        for stack, count in self.stacks.items():
+            indexes = []
+            for label in stack[1:]:
+                idx = frame_index.get(label)
+                if idx is None:
+                    idx = frame_index[label] = len(frames)
+                    func, _, location = label.partition(" (")
+                    file, _, line = location.rstrip(")").rpartition(":")
+                    frames.append({"name": func, "file": file, "line": int(line) if line.isdigit() else None})
+                indexes.append(idx)
+            samples, weights = per_thread.setdefault(stack[0], ([], []))
+            samples.append(indexes)
+            weights.append(count * self.interval)
+
+        profiles = []
+        for thread, (samples, weights) in sorted(per_thread.items()):
+            profiles.append({
+                "type": "sampled",
+                "name": thread,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "app.core.profiling",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+
+class SQLTimer:
+    """
+    Per-statement timing from SQLAlchemy cursor events.
+
+    Listeners are attached on start() and removed on stop(), so there is no cost outside a session.
+    """
+
+    def __init__(self, engine: Engine, max_statements: int = 200) -> None:
+        self.engine = engine
+        self.max_statements = max_statements
+        self.stats: Dict[str, List[float]] = {}  # statement -> [count, total, max]
+
+    def start(self) -> None:
+        event.listen(self.engine, "before_cursor_execute", self._before)
+        event.listen(self.engine, "after_cursor_execute", self._after)
+        event.listen(self.engine, "handle_error", self._error)
+
+    def stop(self) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._before)
+        event.remove(self.engine, "after_cursor_execute", self._after)
+        event.remove(self.engine, "handle_error", self._error)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("diagnostics_started", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info.get("diagnostics_started")
+        if not started:
+            return  # began before the listeners were attached
+        elapsed = time.perf_counter() - started.pop()
+        # The SQL as compiled: hooks such as install_statement_deadlines rewrite `statement` per
+        # execution (time-left hints, tags), which would make every run a separate entry
+        sql = getattr(context, "statement", None) or statement
+        key = _SQL_WHITESPACE.sub(" ", sql).strip()[:500]
+        if key not in self.stats and len(self.stats) >= self.max_statements:
+            key = "<other statements>"
+        stats = self.stats.setdefault(key, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
+
+    def _error(self, exception_context) -> None:
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("diagnostics_started"):
+            conn.info["diagnostics_started"].pop()
+
+    def report(self) -> List[Dict[str, Any]]:
+        rows = sorted(self.stats.items(), key=lambda kv: kv[1][1], reverse=True)
+        return [
+            {
+                "statement": statement,
+                "count": int(count),
+                "total_ms": round(total * 1000, 3),
+                "avg_ms": round(total * 1000 / count, 3),
+                "max_ms": round(peak * 1000, 3),
+            }
+            for statement, (count, total, peak) in rows
+        ]
+
+
+class ProfileSession:
+    """
+    One profiling run: for `seconds`, or until `requests` requests under `path` have completed
+    (with `seconds` as the upper bound). In request mode the sampler only records while a
+    matching request is in flight.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self,
+                 *,
+                 seconds: float,
+                 requests: Optional[int],
+                 path: str,
+                 interval: float,
+                 engine: Optional[Engine]) -> None:
+        self.id = next(self._ids)
+        self.seconds = seconds
+        self.requests = requests
+        self.path = path
+        self.sampler = StackSampler(interval)
+        self.sql = SQLTimer(engine) if engine is not None else None
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.claimed = 0
+        self.completed = 0
+        self._inflight = 0
+        self._timer: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self.finished_at is None
+
+    def start(self) -> None:
+        self.sampler.paused = self.requests is not None
+        if self.sql is not None:
+            self.sql.start()
+        self.sampler.start()
+        self._timer = asyncio.create_task(self._expire())
+
+    def finish(self) -> None:
+        if not self.running:
+            return
+        self.sampler.stop()
+        if self.sql is not None:
+            self.sql.stop()
+        self.finished_at = time.time()
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+
+    async def _expire(self) -> None:
+        await asyncio.sleep(self.seconds)
+        self.finish()
+
+    def claim(self, path: str) -> bool:
+        """Called for each request; True if the request is part of this session."""
+        if not self.running or self.requests is None or not path.startswith(self.path):
+            return False
+        if self.claimed >= self.requests:
+            return False
+        self.claimed += 1
+        self._inflight += 1
+        self.sampler.paused = False
+        return True
+
+    def release(self) -> None:
+        self._inflight -= 1
+        self.completed += 1
+        if self._inflight == 0:
+            self.sampler.paused = True
+        if self.completed >= self.requests:
+            self.finish()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "running": self.running,
+            "mode": "requests" if self.requests is not None else "seconds",
+            "seconds": self.seconds,
+            "requests": self.requests,
+            "requests_completed": self.completed,
+            "path": self.path,
+            "interval_ms": self.sampler.interval * 1000,
+            "samples": self.sampler.samples,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class Profiler:
+    """Holds the current (or last) profiling session of this process; one session at a time."""
+
+    def __init__(self) -> None:
+        self.session: Optional[ProfileSession] = None
+
+    @property
+    def watching(self) -> bool:
+        # The only check made per request when no request-mode session is running
+        session = self.session
+        return session is not None and session.requests is not None and session.running
+
+    def start(self,
+              *,
+              seconds: float,
+              requests: Optional[int] = None,
+              path: str = "/",
+              interval: float = 0.005,
+              engine: Optional[Engine] = None) -> ProfileSession:
+        if self.session is not None and self.session.running:
+            raise ProfilerBusyError(f"Profiling session {self.session.id} is still running")
+        self.session = ProfileSession(seconds=seconds, requests=requests, path=path, interval=interval, engine=engine)
+        self.session.start()
+        return self.session
+
+    def stop(self) -> Optional[ProfileSession]:
+        if self.session is not None:
+            self.session.finish()
+        return self.session
+
+
+# Global profiler (per process)
+profiler = Profiler()
+
+
+def dump_tasks(limit: int = 20) -> List[Dict[str, Any]]:
+    """Snapshot of the running event loop's tasks and where each one is suspended."""
+    dump = []
+    for task in asyncio.all_tasks():
+        coro = task.get_coro()
+        stack = [
+            f"{_short_path(frame.f_code.co_filename)}:{frame.f_lineno} in {frame.f_code.co_name}"
+            for frame in task.get_stack(limit=limit)
+        ]
+        dump.append({
+            "name": task.get_name(),
+            "coroutine": getattr(coro, "__qualname__", repr(coro)),
+            "done": task.done(),
+            "current": task is asyncio.current_task(),
+            "stack": stack,
+        })
+    return sorted(dump, key=lambda t: t["name"])
+
+
+class ProfilingMiddleware:
+    """Marks requests that belong to a request-mode profiling session; a no-op otherwise."""
+
+    def __init__(self, app: ASGIApp, profiler: Profiler = profiler) -> None:
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        session = self.profiler.session if self.profiler.watching else None
+        if session is None or scope["type"] != "http" or not session.claim(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            session.release()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import types
+import typing
+from dataclasses import make_dataclass
+from decimal import Decimal
+from typing import Any, Dict, Generic, Iterable, List, Optional, Sequence, Type, TypeVar, Union
+
+import orjson
+from pydantic import BaseModel
+from sqlalchemy import Select, Table, select
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import ColumnElement
+from starlette.responses import Response
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def _default(value: Any) -> Any:
+    # Types orjson doesn't know, serialized the way Pydantic does in JSON mode
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _unwrap_optional(annotation: Any) -> tuple:
+    """(inner annotation, allows None)"""
+    if typing.get_origin(annotation) in (Union, types.UnionType):
+        args = typing.get_args(annotation)
+        inner = [a for a in args if a is not type(None)]
+        if len(inner) == 1:
+            return inner[0], len(inner) < len(args)
+    return annotation, False
+
+
+class RecordType(Generic[M]):
+    """
+    Fast path from SQLAlchemy rows to JSON for list endpoints, without a Pydantic model per row.
+
+    - The record class is a slots dataclass with the response model's fields, built from each row
+      positionally (no per-row validation, no per-instance __dict__).
+    - Columns are matched to the model's fields once, at import: a missing column, a type that
+      doesn't fit the field or a nullable column for a required field raises TypeError then.
+    - Records serialize with orjson straight to bytes, in the same JSON shape as the model.
+
+    The model stays the API contract: keep it as the route's response_model for the OpenAPI docs.
+    """
+
+    def __init__(self, model: Type[M], source: Union[Table, Sequence[ColumnElement]]) -> None:
+        available: Dict[str, ColumnElement] = {c.key: c for c in (source.c if isinstance(source, Table) else source)}
+        self.model = model
+        self.fields = tuple(model.model_fields)
+        missing = [f for f in self.fields if f not in available]
+        if missing:
+            raise TypeError(f"{model.__name__}: no column for field(s) {', '.join(missing)}")
+        self.columns: List[ColumnElement] = [available[f] for f in self.fields]
+        for name, column in zip(self.fields, self.columns):
+            self._check_field(name, column)
+        self.cls = make_dataclass(f"{model.__name__}Record", self.fields, slots=True)
+
+    def _check_field(self, name: str, column: ColumnElement) -> None:
+        annotation, optional = _unwrap_optional(self.model.model_fields[name].annotation)
+        if getattr(column, "nullable", False) and not optional:
+            raise TypeError(f"{self.model.__name__}.{name}: column is nullable but the field is not Optional")
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            return
+        if isinstance(annotation, type) and not issubclass(python_type, annotation):
+            raise TypeError(
+                f"{self.model.__name__}.{name}: column type {python_type.__name__} "
+                f"doesn't fit field type {annotation.__name__}"
+            )
+
+    def select(self) -> Select:
+        """SELECT of exactly the model's columns, in field order (what from_rows expects)."""
+        return select(*self.columns)
+
+    def from_rows(self, rows: Iterable[Row]) -> List[Any]:
+        cls = self.cls
+        return [cls(*row) for row in rows]
+
+    def dumps(self, content: Any) -> bytes:
+        """Serialize records, or dicts/lists containing them, to JSON."""
+        return orjson.dumps(content, default=_default)
+
+    def page_response(self, rows: Iterable[Row], next_cursor: Optional[str] = None) -> Response:
+        """A Page[model]-shaped JSON response ({"items": [...], "next_cursor": ...})."""
+        content = {"items": self.from_rows(rows), "next_cursor": next_cursor}
+        return Response(self.dumps(content), media_type="application/json")
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterator, Optional, Tuple
+
+# File header: magic, layout version, slot count, slot size, ways per set
+_FILE_HEADER = struct.Struct("<4sIIII")
+_FILE_HEADER_SIZE = 64
+_MAGIC = b"FVSC"
+_LAYOUT_VERSION = 1
+
+# Slot header: seq, (pad), key hash, expires at, last access, key length, (pad), value length
+_SLOT_HEADER = struct.Struct("<IIQddHHI")
+_SEQ = struct.Struct("<I")
+_LAST_ACCESS = struct.Struct("<d")
+_LAST_ACCESS_OFFSET = 24
+
+_READ_RETRIES = 4
+
+
+def _hash_key(key: bytes) -> int:
+    # Must be stable across processes, so not hash(); 0 marks an empty slot
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") or 1
+
+
+class SharedMemoryCache:
+    """
+    Fixed-size key/value cache in a memory-mapped file, shared by all processes that open it.
+
+    - Every uvicorn worker of a container maps the same file (by default under /dev/shm),
+      so a value cached by one worker is a hit for all of them.
+    - Set-associative layout: a key hashes to a set of `ways` fixed-size slots; when the set is
+      full the expired or least recently used slot is evicted. Values that don't fit a slot
+      are simply not cached.
+    - Reads take no lock: each slot carries a sequence number (odd while being written) and a
+      read is retried if the sequence changed under it. Writers lock only the key's set.
+    - The layout is part of the file name (`path` plus a suffix), so processes configured with
+      a different layout, e.g. during a rolling restart, use their own file instead of resizing
+      one that others still have mapped.
+    """
+
+    def __init__(self, path: str, *, slots: int = 4096, slot_size: int = 4096, ways: int = 8) -> None:
+        if slot_size % 8 or slot_size <= _SLOT_HEADER.size:
+            raise ValueError("slot_size must be a multiple of 8 larger than the slot header")
+        self.ways = max(1, min(ways, slots))
+        self.sets = max(1, slots // self.ways)
+        self.slots = self.sets * self.ways
+        self.slot_size = slot_size
+        self.path = f"{path}.v{_LAYOUT_VERSION}-{self.slots}x{slot_size}-{self.ways}way"
+        self.hits = 0
+        self.misses = 0
+        self._thread_lock = threading.Lock()
+
+        size = _FILE_HEADER_SIZE + self.slots * slot_size
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            self._init_file(size)
+            self._mm = mmap.mmap(self._fd, size)
+        except Exception:
+            os.close(self._fd)
+            raise
+
+    def close(self) -> None:
+        self._mm.close()
+        os.close(self._fd)
+
+    # --- public API -------------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[bytes]:
+        kb = key.encode()
+        h = _hash_key(kb)
+        now = time.time()
+        for offset in self._set_offsets(h):
+            found, value = self._read_slot(offset, h, kb, now)
+            if found:
+                if value is None:
+                    break
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        """Store a value; returns False if it doesn't fit in a slot."""
+        kb = key.encode()
+        if _SLOT_HEADER.size + len(kb) + len(value) > self.slot_size or len(kb) > 0xFFFF:
+            return False
+        h = _hash_key(kb)
+        now = time.time()
+        expires_at = now + ttl if ttl else 0.0
+        with self._set_lock(h):
+            offset = self._choose_slot(h, kb, now)
+            self._write_slot(offset, h, kb, value, expires_at, now)
+        return True
+
+    def delete(self, key: str) -> bool:
+        kb = key.encode()
+        h = _hash_key(kb)
+        with self._set_lock(h):
+            for offset in self._set_offsets(h):
+                if self._slot_key_matches(offset, h, kb):
+                    self._write_slot(offset, 0, b"", b"", 0.0, 0.0)
+                    return True
+        return False
+
+    def clear(self) -> None:
+        for set_index in range(self.sets):
+            with self._set_lock(set_index):
+                for offset in self._set_offsets(set_index):
+                    self._write_slot(offset, 0, b"", b"", 0.0, 0.0)
+
+    def get_json(self, key: str) -> Any:
+        raw = self.get(key)
+        return None if raw is None else json.loads(raw)
+
+    def set_json(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        return self.set(key, json.dumps(value, separators=(",", ":"), default=str).encode(), ttl)
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: Optional[float] = None) -> Any:
+        """
+        Return the cached JSON value, or await loader() and cache its result. Either way the value
+        has been through JSON, so a miss returns what a later hit will (e.g. datetimes as strings).
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return json.loads(cached)
+        raw = json.dumps(await loader(), separators=(",", ":"), default=str).encode()
+        self.set(key, raw, ttl)
+        return json.loads(raw)
+
+    # --- slots --------------------------------------------------------------------------------
+
+    def _set_offsets(self, h: int) -> Iterator[int]:
+        first = (h % self.sets) * self.ways
+        for i in range(first, first + self.ways):
+            yield _FILE_HEADER_SIZE + i * self.slot_size
+
+    def _read_slot(self, offset: int, h: int, kb: bytes, now: float) -> Tuple[bool, Optional[bytes]]:
+        """Returns (key found, value); value is None for an expired entry."""
+        mm = self._mm
+        for _ in range(_READ_RETRIES):
+            seq, _, kh, expires_at, _, klen, _, vlen = _SLOT_HEADER.unpack_from(mm, offset)
+            if seq & 1:
+                continue  # being written
+            if kh != h:
+                return False, None
+            start = offset + _SLOT_HEADER.size
+            stored_key = mm[start:start + klen]
+            value = mm[start + klen:start + klen + vlen]
+            if _SEQ.unpack_from(mm, offset)[0] != seq:
+                continue  # changed while we were reading
+            if stored_key != kb:
+                return False, None
+            if expires_at and expires_at <= now:
+                return True, None
+            # Approximate LRU bookkeeping; not covered by seq on purpose
+            _LAST_ACCESS.pack_into(mm, offset + _LAST_ACCESS_OFFSET, now)
+            return True, value
+        return False, None
+
+    def _slot_key_matches(self, offset: int, h: int, kb: bytes) -> bool:
+        _, _, kh, _, _, klen, _, _ = _SLOT_HEADER.unpack_from(self._mm, offset)
+        start = offset + _SLOT_HEADER.size
+        return kh == h and self._mm[start:start + klen] == kb
+
+    def _choose_slot(self, h: int, kb: bytes, now: float) -> int:
+        victim, victim_access = None, None
+        for offset in self._set_offsets(h):
+            _, _, kh, expires_at, last_access, klen, _, _ = _SLOT_HEADER.unpack_from(self._mm, offset)
+            if kh == h and self._mm[offset + _SLOT_HEADER.size:offset + _SLOT_HEADER.size + klen] == kb:
+                return offset  # overwrite in place
+            if kh == 0 or (expires_at and expires_at <= now):
+                access = -1.0  # free or expired: always the best victim
+            else:
+                access = last_access
+            if victim_access is None or access < victim_access:
+                victim, victim_access = offset, access
+        return victim
+
+    def _write_slot(self, offset: int, h: int, kb: bytes, value: bytes, expires_at: float, now: float) -> None:
+        mm = self._mm
+        seq = _SEQ.unpack_from(mm, offset)[0]
+        _SEQ.pack_into(mm, offset, (seq + 1) & 0xFFFFFFFF | 1)
+        start = offset + _SLOT_HEADER.size
+        mm[start:start + len(kb)] = kb
+        mm[start + len(kb):start + len(kb) + len(value)] = value
+        _SLOT_HEADER.pack_into(mm, offset, (seq + 1) & 0xFFFFFFFF | 1, 0, h, expires_at, now, len(kb), 0, len(value))
+        _SEQ.pack_into(mm, offset, (seq + 2) & 0xFFFFFFFE)
+
+    @contextmanager
+    def _set_lock(self, h: int) -> Iterator[None]:
+        # Byte-range lock on the set's first slot: writers of other sets don't wait on each other.
+        # POSIX record locks are per process, so threads in this process use a regular lock too.
+        start = _FILE_HEADER_SIZE + (h % self.sets) * self.ways * self.slot_size
+        with self._thread_lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, start)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, start)
+
+    def _init_file(self, size: int) -> None:
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            expected = _FILE_HEADER.pack(_MAGIC, _LAYOUT_VERSION, self.slots, self.slot_size, self.ways)
+            current_size = os.fstat(self._fd).st_size
+            if current_size == 0:
+                # New file: zeroed (empty) slots. Never truncate a sized file, others may map it
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, expected, 0)
+                return
+            if current_size != size or os.pread(self._fd, len(expected), 0) != expected:
+                raise ValueError(f"{self.path} is not a cache file with this layout")
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+
+def default_cache_path(name: str) -> str:
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else "/tmp"
+    return os.path.join(base, f"{name}-cache")
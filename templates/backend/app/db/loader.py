@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Optional, Set, TypeVar, Union
+
+from sqlalchemy import Table, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.tables import metadata
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+BatchFunc = Callable[[List[K]], Awaitable[Dict[K, V]]]
+
+
+class DataLoader(Generic[K, V]):
+    """
+    Batches and caches key lookups, DataLoader style.
+
+    All load() calls made in the same event-loop tick are collected and resolved by a single
+    call to batch_fn. Keys are deduplicated and results cached for the loader's lifetime,
+    so one loader per request gives per-request caching. Missing keys resolve to None.
+    """
+
+    def __init__(self, batch_fn: BatchFunc, *, max_batch_size: int = 500) -> None:
+        self._batch_fn = batch_fn
+        self._max_batch_size = max_batch_size
+        self._cache: Dict[K, asyncio.Future] = {}
+        self._pending: List[K] = []
+        self._scheduled = False
+        self._batches: Set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> Optional[V]:
+        fut = self._cache.get(key)
+        if fut is None or fut.cancelled():
+            loop = asyncio.get_running_loop()
+            fut = loop.create_future()
+            self._cache[key] = fut
+            self._pending.append(key)
+            if not self._scheduled:
+                self._scheduled = True
+                loop.call_soon(self._dispatch)
+        # Other callers may wait on the same future: cancelling this one must not cancel it
+        return await asyncio.shield(fut)
+
+    async def load_many(self, keys: Iterable[K]) -> List[Optional[V]]:
+        return list(await asyncio.gather(*(self.load(k) for k in keys)))
+
+    def prime(self, key: K, value: V) -> None:
+        """Seed the cache, e.g. with a row already fetched by another query."""
+        if key not in self._cache:
+            fut = asyncio.get_running_loop().create_future()
+            fut.set_result(value)
+            self._cache[key] = fut
+
+    def clear(self, key: Optional[K] = None) -> None:
+        """Forget a cached key (or everything), e.g. after writing to it."""
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    def _dispatch(self) -> None:
+        keys, self._pending = self._pending, []
+        self._scheduled = False
+        for i in range(0, len(keys), self._max_batch_size):
+            task = asyncio.ensure_future(self._run_batch(keys[i:i + self._max_batch_size]))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, keys: List[K]) -> None:
+        results: Optional[Dict[K, V]] = None
+        error: Optional[Exception] = None
+        try:
+            results = await self._batch_fn(keys)
+        except Exception as e:
+            error = e
+        finally:
+            # Also runs when this task is cancelled, so no waiter is left hanging
+            for key in keys:
+                fut = self._cache.get(key)
+                if fut is None or fut.done():
+                    continue
+                if results is not None:
+                    fut.set_result(results.get(key))
+                    continue
+                # Don't cache failures; a later load() retries
+                del self._cache[key]
+                if error is not None:
+                    fut.set_exception(error)
+                else:
+                    fut.cancel()
+
+
+class Loaders:
+    """
+    Per-request registry of table loaders that share one AsyncSession.
+
+    A session can only run one statement at a time, so batches from different
+    loaders are serialized on a shared lock.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+        self._lock = asyncio.Lock()
+        self._loaders: Dict[tuple, DataLoader] = {}
+
+    def table(self, table: Union[str, Table], key: str = "id") -> DataLoader[Any, Row]:
+        """Loader returning rows of a `metadata` table by a (unique) key column."""
+        tbl = metadata.tables[table] if isinstance(table, str) else table
+        cache_key = (tbl.name, key)
+        loader = self._loaders.get(cache_key)
+        if loader is None:
+            loader = DataLoader(self._table_batch_fn(tbl, key))
+            self._loaders[cache_key] = loader
+        return loader
+
+    def _table_batch_fn(self, table: Table, key: str) -> BatchFunc:
+        column = table.c[key]
+
+        async def batch(keys: List[Any]) -> Dict[Any, Row]:
+            async with self._lock:
+                result = await self.db.execute(select(table).where(column.in_(keys)))
+                return {row._mapping[column]: row for row in result}
+
+        return batch
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement, operators
+from sqlalchemy.sql.elements import UnaryExpression
+
+from app.exceptions import InvalidInputError
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class Keyset:
+    """
+    Sort order of a keyset-paginated listing, e.g. Keyset(jobs.c.created_at.desc(), jobs.c.id.desc()).
+
+    - The columns together must be unique (end with the primary key) and NOT NULL.
+    - Back it with an index in the same column order so every page is one index range scan;
+      InnoDB secondary indexes already end with the primary key.
+    """
+
+    def __init__(self, *columns: ColumnElement) -> None:
+        if not columns:
+            raise ValueError("Keyset needs at least one column")
+        self.columns: List[ColumnElement] = []
+        self.descending: List[bool] = []
+        for col in columns:
+            desc = isinstance(col, UnaryExpression) and col.modifier is operators.desc_op
+            if isinstance(col, UnaryExpression):
+                col = col.element
+            self.columns.append(col)
+            self.descending.append(desc)
+        self.names = [c.key for c in self.columns]
+
+    @property
+    def order_by(self) -> List[ColumnElement]:
+        return [c.desc() if d else c.asc() for c, d in zip(self.columns, self.descending)]
+
+    def after(self, values: Sequence[Any]) -> ColumnElement:
+        """
+        Rows strictly after `values` in this order, expanded to
+        (a > :a) OR (a = :a AND b > :b) OR ... so columns can mix directions.
+        """
+        clauses = []
+        for i, (col, desc) in enumerate(zip(self.columns, self.descending)):
+            equal = [self.columns[j] == values[j] for j in range(i)]
+            beyond = col < values[i] if desc else col > values[i]
+            clauses.append(and_(*equal, beyond))
+        return or_(*clauses)
+
+    def values_of(self, row: Row) -> Tuple[Any, ...]:
+        return tuple(row._mapping[c] for c in self.columns)
+
+
+# --- cursors --------------------------------------------------------------------------------------
+# A cursor is the keyset values of the last row of a page, as url-safe base64 JSON. Values are
+# tagged with their type so they round-trip exactly (datetimes keep microseconds, decimals digits).
+
+def _dump(value: Any) -> List[Any]:
+    if isinstance(value, bool):
+        return ["b", value]
+    if isinstance(value, int):
+        return ["i", value]
+    if isinstance(value, datetime):
+        return ["t", value.isoformat()]
+    if isinstance(value, date):
+        return ["d", value.isoformat()]
+    if isinstance(value, Decimal):
+        return ["n", str(value)]
+    if isinstance(value, float):
+        return ["f", value]
+    if isinstance(value, str):
+        return ["s", value]
+    raise TypeError(f"Unsupported keyset value type: {type(value).__name__}")
+
+
+_LOADERS = {
+    "b": bool,
+    "i": int,
+    "t": datetime.fromisoformat,
+    "d": date.fromisoformat,
+    "n": Decimal,
+    "f": float,
+    "s": str,
+}
+
+
+def encode_cursor(keyset: Keyset, values: Sequence[Any]) -> str:
+    payload = {"k": keyset.names, "v": [_dump(v) for v in values]}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(keyset: Keyset, cursor: str) -> Tuple[Any, ...]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload["k"] != keyset.names or len(payload["v"]) != len(keyset.names):
+            raise InvalidInputError("Cursor does not belong to this listing")
+        return tuple(_LOADERS[tag](value) for tag, value in payload["v"])
+    except InvalidInputError:
+        raise
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidInputError("Invalid cursor") from e
+
+
+@dataclass
+class PageResult:
+    rows: List[Row]
+    next_cursor: Optional[str]
+
+
+def paginate(stmt: Select, keyset: Keyset, *, limit: int, cursor: Optional[str] = None) -> Select:
+    """Add keyset ordering, the cursor condition and limit + 1 (to detect a next page) to a select."""
+    if cursor:
+        stmt = stmt.where(keyset.after(decode_cursor(keyset, cursor)))
+    return stmt.order_by(*keyset.order_by).limit(limit + 1)
+
+
+async def fetch_page(db: AsyncSession,
+                     stmt: Select,
+                     keyset: Keyset,
+                     *,
+                     limit: int = DEFAULT_PAGE_SIZE,
+                     cursor: Optional[str] = None) -> PageResult:
+    """Run a keyset-paginated select; `stmt` must select the keyset columns."""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    rows = (await db.execute(paginate(stmt, keyset, limit=limit, cursor=cursor))).all()
+    if len(rows) <= limit:
+        return PageResult(rows, None)
+    rows = rows[:limit]
+    return PageResult(rows, encode_cursor(keyset, keyset.values_of(rows[-1])))
@@ -1,27 +1,83 @@
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from typing import Mapping, Optional
 from app.config import settings
+from app.core.admission import route_class_var
+from app.core.deadline import install_statement_deadlines
+from app.core.metrics import metrics
+from app.db.url import async_database_url
+import time
 
-# aiomysql doesn't support ssl_disabled parameter, so we remove it from the URL
-def clean_database_url(url: str) -> str:
-    """Remove unsupported parameters from database URL for aiomysql."""
-    parsed = urlparse(url)
-    query_params = parse_qs(parsed.query)
-    
-    # Remove unsupported parameters for aiomysql
-    unsupported_params = ['ssl_disabled']
-    for param in unsupported_params:
-        query_params.pop(param, None)
-    
-    # Reconstruct URL without unsupported parameters
-    new_query = urlencode(query_params, doseq=True)
-    new_parsed = parsed._replace(query=new_query)
-    return urlunparse(new_parsed)
-
-# Create async engine with cleaned URL
-database_url = clean_database_url(settings.database_url)
-engine = create_async_engine(database_url, echo=settings.echo_sql, future=True)
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited, labelled by route class."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.observe(
+                "db_pool_checkout_wait_seconds",
+                time.perf_counter() - started,
+                route_class=route_class_var.get(),
+            )
+
+
+# Create async engine on the configured driver
+database_url = async_database_url(settings.database_url, settings.db_driver)
+engine = create_async_engine(
+    database_url,
+    echo=settings.echo_sql,
+    future=True,
+    poolclass=TimedQueuePool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+)
+
+install_statement_deadlines(engine.sync_engine)
+
+# Unpooled connections for KILL QUERY: the pool may be exhausted by the very queries being killed
+_admin_engine = create_async_engine(database_url, poolclass=NullPool)
+
+_RUNNING_QUERY = text("SELECT 1 FROM information_schema.PROCESSLIST WHERE ID = :id AND INFO LIKE :tag")
+
+
+async def kill_queries(statements: Mapping[int, Optional[str]]) -> int:
+    """
+    Stop statements a request is still running; returns how many were killed.
+
+    `statements` (MySQL connection id -> statement tag) is the request's live mapping, so each
+    entry is re-checked right before its KILL. A tagged statement is only killed while the process
+    list still shows it, so a connection that has moved on to another request's query is spared.
+    """
+    killed = 0
+    async with _admin_engine.connect() as conn:
+        for thread_id, tag in list(statements.items()):
+            if tag is not None:
+                running = await conn.scalar(_RUNNING_QUERY, {"id": thread_id, "tag": f"%/* {tag} */"})
+                if not running:
+                    continue
+            if thread_id not in statements or statements[thread_id] != tag:
+                continue  # finished in the meantime
+            try:
+                await conn.execute(text(f"KILL QUERY {int(thread_id)}"))
+                killed += 1
+            except DBAPIError:
+                pass  # finished in the meantime
+    return killed
+
+def _collect_pool_metrics(m) -> None:
+    pool = engine.pool
+    m.set("db_pool_size", pool.size())
+    m.set("db_pool_checked_out", pool.checkedout())
+    m.set("db_pool_overflow", max(0, pool.overflow()))
+
+
+metrics.register_collector(_collect_pool_metrics)
 
 SessionLocal = sessionmaker(
     bind=engine, class_=AsyncSession, expire_on_commit=False
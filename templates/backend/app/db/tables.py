@@ -1,5 +1,6 @@
-from sqlalchemy import MetaData, Table, Column
-from sqlalchemy import Integer, String, DateTime
+from sqlalchemy import MetaData, Table, Column, Index, text
+from sqlalchemy import BigInteger, Integer, String, DateTime, Text, JSON
+from sqlalchemy.dialects.mysql import DATETIME
 
 metadata = MetaData()
 
@@ -8,3 +9,18 @@ metadata = MetaData()
 alembic_version = Table('alembic_version', metadata, 
     Column('version_num', String(32), nullable=False, primary_key=True))
 
+
+# Background job queue, polled by the worker with SELECT ... FOR UPDATE SKIP LOCKED
+jobs = Table('jobs', metadata,
+    Column('id', BigInteger, primary_key=True, autoincrement=True),
+    Column('kind', String(100), nullable=False),
+    Column('payload', JSON, nullable=False),
+    Column('status', String(16), nullable=False, server_default='queued'),
+    Column('attempts', Integer, nullable=False, server_default='0'),
+    Column('max_attempts', Integer, nullable=False, server_default='5'),
+    Column('last_error', Text, nullable=True),
+    Column('run_at', DATETIME(fsp=6), nullable=False, server_default=text('CURRENT_TIMESTAMP(6)')),
+    Column('locked_at', DATETIME(fsp=6), nullable=True),
+    Column('created_at', DATETIME(fsp=6), nullable=False, server_default=text('CURRENT_TIMESTAMP(6)')),
+    Index('ix_jobs_status_run_at', 'status', 'run_at'),
+    Index('ix_jobs_created_at_id', 'created_at', 'id'))
@@ -0,0 +1,29 @@
+from typing import Optional
+from sqlalchemy.engine import URL, make_url
+
+# Async MySQL drivers the app can run on (DB_DRIVER); all are SQLAlchemy dialects
+ASYNC_DRIVERS = ("aiomysql", "asyncmy")
+# Alembic and other sync tooling
+SYNC_DRIVER = "mysqlconnector"
+
+# URL query parameters the drivers don't accept (kept in DATABASE_URL for other MySQL clients)
+_UNSUPPORTED_PARAMS = ("ssl_disabled",)
+
+
+def _with_driver(url: str, driver: Optional[str]) -> URL:
+    parsed = make_url(url)
+    if driver:
+        parsed = parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}")
+    return parsed.difference_update_query(_UNSUPPORTED_PARAMS)
+
+
+def async_database_url(url: str, driver: Optional[str] = None) -> str:
+    """URL for the app's async engine; `driver` replaces the one in the URL (empty keeps it)."""
+    if driver and driver not in ASYNC_DRIVERS:
+        raise ValueError(f"Unsupported async driver '{driver}' (expected one of {', '.join(ASYNC_DRIVERS)})")
+    return _with_driver(url, driver).render_as_string(hide_password=False)
+
+
+def sync_database_url(url: str) -> str:
+    """The same database through the sync driver, for Alembic."""
+    return _with_driver(url, SYNC_DRIVER).render_as_string(hide_password=False)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import List, Optional, TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.sql import Executable
+
+S = TypeVar("S", bound=Executable)
+
+# Hot, parameterless statements executed once during warm-up so their compiled form is cached
+_warmup_statements: List[Executable] = []
+
+
+def warmup_statement(statement: S) -> S:
+    """Register a module-level statement to be compiled and run during warm-up; returns it unchanged."""
+    _warmup_statements.append(statement)
+    return statement
+
+
+class Readiness:
+    """Process readiness, reported by /readyz."""
+
+    def __init__(self) -> None:
+        self.ready = False
+        self.warmed_connections = 0
+        self.error: Optional[str] = None
+
+
+readiness = Readiness()
+
+
+async def warm_pool(engine: AsyncEngine,
+                    connections: int,
+                    statements: Optional[List[Executable]] = None,
+                    logger: Optional[logging.Logger] = None) -> int:
+    """
+    Open `connections` pool connections at once (TCP, auth and TLS happen now instead of on the
+    first requests), run the warm-up statements, then return them all to the pool.
+    A failing statement (e.g. its table isn't migrated yet) is logged and skipped.
+    Returns the number of connections opened; with `connections` <= 0 warm-up is disabled.
+    """
+    if connections <= 0:
+        return 0
+    opened: List[AsyncConnection] = []
+    try:
+        async def open_one() -> None:
+            conn = await engine.connect()
+            opened.append(conn)
+            await conn.execute(text("SELECT 1"))
+
+        # Let every attempt finish before raising, so connections opened late are closed too
+        results = await asyncio.gather(*(open_one() for _ in range(connections)), return_exceptions=True)
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            raise errors[0]
+
+        # Compiled statements are cached per engine, so running each once on one connection is enough
+        for statement in _warmup_statements if statements is None else statements:
+            try:
+                await opened[0].execute(statement)
+            except Exception as e:
+                await opened[0].rollback()
+                if logger:
+                    logger.warning(f"Warm-up statement failed: {type(e).__name__}: {e}")
+    finally:
+        for conn in opened:
+            await conn.close()
+    return len(opened)
+
+
+async def warm_up(engine: AsyncEngine,
+                  connections: int,
+                  logger: logging.Logger,
+                  *,
+                  timeout: float = 30.0,
+                  retry_interval: float = 2.0) -> None:
+    """Warm the pool, retrying until the database is reachable, then mark the process ready."""
+    if connections <= 0:
+        readiness.ready = True
+        logger.info("Database warm-up disabled (DB_WARMUP_CONNECTIONS=0 or DB_POOL_SIZE=0)")
+        return
+    while True:
+        try:
+            readiness.warmed_connections = await asyncio.wait_for(warm_pool(engine, connections, logger=logger), timeout)
+            break
+        except Exception as e:
+            readiness.error = f"{type(e).__name__}: {e}"
+            logger.warning(f"Database warm-up failed, retrying in {retry_interval:.0f}s: {readiness.error}")
+            await asyncio.sleep(retry_interval)
+
+    readiness.error = None
+    readiness.ready = True
+    logger.info(f"Database warm-up complete ({readiness.warmed_connections} connections)")
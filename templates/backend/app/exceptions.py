@@ -7,3 +7,6 @@ class InvalidInputError(Exception):
 class RecordNotFoundException(Exception):
     pass
 
+
+class ProfilerBusyError(Exception):
+    pass
@@ -1,10 +1,95 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 from app.api.v1.main_routes import router as main_router
+from app.api.system_routes import router as system_router
+from app.api.batch_routes import BATCH_PATH, router as batch_router
+from app.api.diagnostics_routes import router as diagnostics_router
+from app.config import settings
+from app.core.admission import AdmissionControlMiddleware
+from app.core.deadline import DeadlineMiddleware
+from app.core.profiling import ProfilingMiddleware
+from app.db.session import engine, kill_queries
+from app.db.warmup import warm_up
 from app.log_setup import get_app_logger
+from app.service_init import get_job_queue
+from app.worker.runner import create_worker
+from app.worker import tasks as _tasks  # noqa: F401  (registers task handlers)
+import asyncio
 import uvicorn
 
-app = FastAPI(title="${PROJECT_NAME} API", logger=get_app_logger())
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open pool connections and compile hot statements in the background; /readyz reports when done
+    warmup_task = asyncio.create_task(warm_up(
+        engine,
+        min(settings.db_warmup_connections, settings.db_pool_size),
+        get_app_logger(),
+        timeout=settings.db_warmup_timeout,
+    ))
+
+    # With the in-process queue the worker has to live in the API process
+    worker = None
+    worker_task = None
+    if settings.worker_backend == "memory":
+        worker = create_worker(get_job_queue(), get_app_logger("app-worker"))
+        worker_task = asyncio.create_task(worker.run())
+
+    yield
+
+    warmup_task.cancel()
+    try:
+        await warmup_task
+    except asyncio.CancelledError:
+        pass
+    if worker is not None:
+        worker.stop()
+        await worker_task
+
+
+app = FastAPI(title="${PROJECT_NAME} API", logger=get_app_logger(), lifespan=lifespan)
+
+# Profiling hooks, only when diagnostics are enabled; idle unless a request-mode session runs
+if settings.diagnostics_token:
+    app.add_middleware(ProfilingMiddleware)
+
+# Compress JSON responses above a size threshold; small bodies aren't worth the CPU
+if settings.gzip_enabled:
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=settings.gzip_minimum_size,
+        compresslevel=settings.gzip_compresslevel,
+    )
+
+# Request deadlines: 504 instead of holding a pool connection after the client has given up.
+# Added before admission control so the deadline covers handling, not the admission queue.
+app.add_middleware(
+    DeadlineMiddleware,
+    default_timeout=settings.request_timeout_default,
+    timeouts=settings.request_timeouts,
+    header=settings.request_timeout_header,
+    kill_queries=kill_queries,
+    kill_grace=settings.request_timeout_kill_grace,
+    exempt_paths=settings.admission_exempt_paths,
+)
+
+# Admission control: shed load with 503 + Retry-After instead of queueing on the db pool.
+# Added before CORS so that rejections still carry CORS headers.
+if settings.admission_enabled:
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        capacity=settings.admission_max_inflight or (settings.db_pool_size + settings.db_max_overflow),
+        limits=settings.admission_limits,
+        route_classes=settings.admission_route_classes,
+        max_queue=settings.admission_max_queue,
+        queue_timeout=settings.admission_queue_timeout,
+        retry_after=settings.admission_retry_after,
+        deadline_header=settings.request_timeout_header,
+        # A batch holds no connection itself; each of its items is admitted on its own
+        exempt_paths=[*settings.admission_exempt_paths, BATCH_PATH],
+    )
 
 # CORS (allow preflight OPTIONS for browser clients)
 app.add_middleware(
@@ -17,6 +102,10 @@ app.add_middleware(
 
 # Register routes
 app.include_router(main_router)
+app.include_router(batch_router)
+app.include_router(system_router)
+if settings.diagnostics_token:
+    app.include_router(diagnostics_router)
 
 if __name__ == "__main__":
     uvicorn.run(
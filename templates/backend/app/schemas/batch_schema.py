@@ -0,0 +1,23 @@
+from typing import Any, List
+from pydantic import BaseModel, Field
+
+
+class BatchItem(BaseModel):
+    """One GET request of a batch, e.g. {"path": "/api/jobs?limit=10"}."""
+    path: str = Field(..., description="API path with optional query string")
+
+
+class BatchRequest(BaseModel):
+    """Request schema for running several GET requests in one round trip."""
+    requests: List[BatchItem]
+
+
+class BatchItemResponse(BaseModel):
+    """Outcome of one batched request, as if it had been sent on its own."""
+    status: int
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    """Responses in the same order as the requests."""
+    responses: List[BatchItemResponse]
@@ -0,0 +1,11 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class ProfileRequest(BaseModel):
+    """Request schema for starting a sampling profile."""
+    seconds: float = Field(10.0, gt=0, le=600, description="Duration, or the upper bound when profiling requests")
+    requests: Optional[int] = Field(None, gt=0, le=10000, description="Profile the next N requests under `path`")
+    path: str = Field("/api", description="Path prefix of the requests to profile")
+    interval_ms: float = Field(5.0, ge=1, le=1000, description="Sampling interval")
+    sql: bool = Field(True, description="Also time each SQL statement")
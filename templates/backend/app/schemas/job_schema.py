@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+
+
+class JobEnqueuedResponse(BaseModel):
+    """Response schema for endpoints that hand work off to the background worker."""
+    job_id: int
+    status: str = "queued"
+
+
+class JobResponse(BaseModel):
+    """A background job as listed by the API."""
+    id: int
+    kind: str
+    status: str
+    attempts: int
+    max_attempts: int
+    last_error: Optional[str] = None
+    run_at: datetime
+    created_at: datetime
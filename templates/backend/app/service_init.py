@@ -1,11 +1,18 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
+from typing import Any
 import logging
 
-from app.db.session import db_session
+from app.config import settings
+from app.core.metrics import metrics
+from app.core.shm_cache import SharedMemoryCache, default_cache_path
+from app.db.session import db_session, SessionLocal
+from app.db.loader import Loaders
 from app.log_setup import get_app_logger
 from app.core.di import ServiceContainer, ServiceLifetime
 from app.services.utility_service import UtilityService
+from app.services.job_service import JobService
+from app.worker.queue import JobQueue, create_job_queue
 
 
 # Global container instance
@@ -33,6 +40,53 @@ def _register_services_once() -> None:
         depends_on=["logger"],
     )
 
+    # JobService as scoped (needs db per-request), depends on logger
+    def _mk_jobs(c: ServiceContainer, scope: dict) -> JobService:
+        return JobService(scope["db"], c.resolve("logger", scope))
+
+    _container.register(
+        "jobs",
+        _mk_jobs,
+        lifetime=ServiceLifetime.SCOPED,
+        depends_on=["logger"],
+    )
+
+    # Batching loaders as scoped: one cache per request, sharing the request's session
+    _container.register(
+        "loaders",
+        lambda _c, scope: Loaders(scope["db"]),
+        lifetime=ServiceLifetime.SCOPED,
+    )
+
+    # Shared-memory cache as singleton: one mapping per process, shared across processes
+    def _mk_cache(_c: ServiceContainer, _s: dict) -> SharedMemoryCache:
+        cache = SharedMemoryCache(
+            settings.shm_cache_path or default_cache_path(settings.project_name),
+            slots=settings.shm_cache_slots,
+            slot_size=settings.shm_cache_slot_size,
+            ways=settings.shm_cache_ways,
+        )
+        metrics.register_collector(lambda m: (
+            m.set("shm_cache_hits", cache.hits),
+            m.set("shm_cache_misses", cache.misses),
+        ))
+        return cache
+
+    _container.register(
+        "cache",
+        _mk_cache,
+        lifetime=ServiceLifetime.SINGLETON,
+    )
+
+    # Job queue as singleton: shared by request handlers (enqueue) and the worker (claim)
+    _container.register(
+        "job_queue",
+        lambda _c, _s: create_job_queue(
+            settings.worker_backend, SessionLocal, max_attempts=settings.worker_max_attempts
+        ),
+        lifetime=ServiceLifetime.SINGLETON,
+    )
+
 
 # Ensure base registrations exist
 _register_services_once()
@@ -42,6 +96,16 @@ def _scope(db: AsyncSession, logger: logging.Logger) -> dict:
     return {"db": db, "logger": logger}
 
 
+def new_scope(db: AsyncSession, logger: logging.Logger) -> dict:
+    """Create a scope for resolving services outside a request (e.g. one per background job)."""
+    return _scope(db, logger)
+
+
+def resolve_service(service_id: str, scope: dict) -> Any:
+    """Resolve any registered service within an existing scope."""
+    return _container.resolve(service_id, scope)
+
+
 def get_utility_service(
     db: AsyncSession = Depends(db_session),
     logobj: logging.Logger = Depends(get_app_logger),
@@ -49,3 +113,28 @@ def get_utility_service(
     """Get utility service. Can be used with FastAPI Depends() or called directly."""
     return _container.resolve("utility", _scope(db, logobj))
 
+
+def get_job_service(
+    db: AsyncSession = Depends(db_session),
+    logobj: logging.Logger = Depends(get_app_logger),
+) -> JobService:
+    """Get job service. Can be used with FastAPI Depends() or called directly."""
+    return _container.resolve("jobs", _scope(db, logobj))
+
+
+def get_loaders(
+    db: AsyncSession = Depends(db_session),
+    logobj: logging.Logger = Depends(get_app_logger),
+) -> Loaders:
+    """Get the request's batching loaders (e.g. loaders.table("jobs").load(job_id))."""
+    return _container.resolve("loaders", _scope(db, logobj))
+
+
+def get_cache() -> SharedMemoryCache:
+    """Get the cache shared by all worker processes (e.g. cache.get_or_load(key, loader, ttl=60))."""
+    return _container.resolve("cache")
+
+
+def get_job_queue() -> JobQueue:
+    """Get the job queue used to hand work off to the background worker."""
+    return _container.resolve("job_queue")
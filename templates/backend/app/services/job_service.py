@@ -0,0 +1,33 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+import logging
+
+from app.core.records import RecordType
+from app.db.pagination import DEFAULT_PAGE_SIZE, Keyset, PageResult, fetch_page
+from app.db.tables import jobs
+from app.schemas.job_schema import JobResponse
+
+# Rows of the jobs listing go straight to JSON in JobResponse's shape (checked at import)
+JOB_RECORDS = RecordType(JobResponse, jobs)
+
+# Newest first; served by ix_jobs_created_at_id
+_JOBS_ORDER = Keyset(jobs.c.created_at.desc(), jobs.c.id.desc())
+_JOBS_LIST = JOB_RECORDS.select()
+
+
+class JobService:
+    """Read side of the background job queue."""
+
+    def __init__(self, db: AsyncSession, logger: Optional[logging.Logger] = None):
+        self.db = db
+        self.logger = logger
+
+    async def list_jobs(self, *, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> PageResult:
+        """
+        List jobs, newest first.
+        This method demonstrates:
+        - Keyset pagination: every page is an index seek, however deep
+        - Opaque cursors instead of OFFSET
+        - Returning rows as-is; JOB_RECORDS turns them into JSON without per-row models
+        """
+        return await fetch_page(self.db, _JOBS_LIST, _JOBS_ORDER, limit=limit, cursor=cursor)
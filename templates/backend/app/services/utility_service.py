@@ -3,6 +3,10 @@ from sqlalchemy import text
 from typing import Optional
 import logging
 
+from app.db.warmup import warmup_statement
+
+_VERSION_QUERY = warmup_statement(text("SELECT VERSION() as version"))
+
 
 class UtilityService:
     """Example service demonstrating service layer pattern with DI."""
@@ -20,7 +24,7 @@ class UtilityService:
         - Dependency injection pattern
         """
         try:
-            result = await self.db.execute(text("SELECT VERSION() as version"))
+            result = await self.db.execute(_VERSION_QUERY)
             row = result.fetchone()
             if row:
                 version = row[0]
@@ -0,0 +1,64 @@
+"""
+Background worker process: python -m app.worker
+"""
+import asyncio
+import logging
+import signal
+
+from sqlalchemy import inspect
+from sqlalchemy.exc import DBAPIError
+
+from app.config import settings
+from app.db.session import engine
+from app.log_setup import get_app_logger
+from app.service_init import get_job_queue
+from app.worker.runner import create_worker
+from app.worker import tasks as _tasks  # noqa: F401  (registers task handlers)
+
+
+async def wait_for_schema(stop: asyncio.Event, logger: logging.Logger) -> bool:
+    """Wait until migrations have created the jobs table; False if stopped first."""
+    waiting = False
+    while not stop.is_set():
+        try:
+            async with engine.connect() as conn:
+                if await conn.run_sync(lambda c: inspect(c).has_table("jobs")):
+                    return True
+        except DBAPIError as e:
+            logger.debug(f"Database not reachable yet: {e}")
+        if not waiting:
+            logger.info("Waiting for the jobs table (run make migrate)")
+            waiting = True
+        try:
+            await asyncio.wait_for(stop.wait(), settings.worker_poll_interval * 5)
+        except asyncio.TimeoutError:
+            pass
+    return False
+
+
+async def main() -> None:
+    logger = get_app_logger("app-worker")
+    if settings.worker_backend == "memory":
+        logger.error("WORKER_BACKEND=memory runs the worker inside the API process; nothing to do here")
+        return
+
+    worker = create_worker(get_job_queue(), logger)
+    stop = asyncio.Event()
+
+    def on_signal() -> None:
+        stop.set()
+        worker.stop()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, on_signal)
+
+    try:
+        if await wait_for_schema(stop, logger):
+            await worker.run()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import func, insert, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.tables import jobs
+
+
+@dataclass
+class Job:
+    """A unit of background work, as handed to the worker."""
+    id: int
+    kind: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    max_attempts: int = 5
+
+
+class JobQueue(ABC):
+    """
+    Queue interface used by the API (enqueue) and the worker (claim/complete/retry/fail).
+
+    claim() marks the returned jobs as running and increments their attempt counter.
+    """
+
+    @abstractmethod
+    async def enqueue(self,
+                      kind: str,
+                      payload: Optional[Dict[str, Any]] = None,
+                      *,
+                      delay: float = 0.0,
+                      max_attempts: Optional[int] = None) -> Job:
+        ...
+
+    @abstractmethod
+    async def claim(self, limit: int) -> List[Job]:
+        ...
+
+    @abstractmethod
+    async def complete(self, job: Job) -> None:
+        ...
+
+    @abstractmethod
+    async def retry(self, job: Job, error: str, delay: float) -> None:
+        ...
+
+    @abstractmethod
+    async def fail(self, job: Job, error: str) -> None:
+        ...
+
+    async def recover_stale(self, older_than: float) -> int:
+        """
+        Requeue jobs left running by a crashed worker, or mark them failed once they are out of
+        attempts (a job that kills its worker would otherwise be requeued forever).
+        Returns the number of jobs recovered.
+        """
+        return 0
+
+    async def wait(self, timeout: float) -> None:
+        """Wait until new work may be available (or the timeout passes)."""
+        await asyncio.sleep(timeout)
+
+
+def _after(seconds: float):
+    """SQL expression for NOW(6) + seconds, evaluated on the database clock."""
+    return func.timestampadd(text("MICROSECOND"), int(seconds * 1_000_000), func.now(6))
+
+
+class MySQLJobQueue(JobQueue):
+    """
+    Job queue stored in the `jobs` table.
+
+    Several workers can poll concurrently: claim() uses SELECT ... FOR UPDATE SKIP LOCKED
+    so each job is handed to exactly one of them without blocking the others.
+    """
+
+    def __init__(self,
+                 session_factory: Callable[[], AsyncSession],
+                 *,
+                 max_attempts: int = 5) -> None:
+        self._session_factory = session_factory
+        self._max_attempts = max_attempts
+
+    async def enqueue(self,
+                      kind: str,
+                      payload: Optional[Dict[str, Any]] = None,
+                      *,
+                      delay: float = 0.0,
+                      max_attempts: Optional[int] = None) -> Job:
+        attempts_limit = max_attempts or self._max_attempts
+        values: Dict[str, Any] = {
+            "kind": kind,
+            "payload": payload or {},
+            "max_attempts": attempts_limit,
+        }
+        if delay > 0:
+            values["run_at"] = _after(delay)
+
+        async with self._session_factory() as session:
+            result = await session.execute(insert(jobs).values(**values))
+            await session.commit()
+        return Job(result.inserted_primary_key[0], kind, payload or {}, 0, attempts_limit)
+
+    async def claim(self, limit: int) -> List[Job]:
+        async with self._session_factory() as session:
+            async with session.begin():
+                rows = (await session.execute(
+                    select(jobs.c.id, jobs.c.kind, jobs.c.payload, jobs.c.attempts, jobs.c.max_attempts)
+                    .where(jobs.c.status == "queued", jobs.c.run_at <= func.now(6))
+                    .order_by(jobs.c.run_at, jobs.c.id)
+                    .limit(limit)
+                    .with_for_update(skip_locked=True)
+                )).all()
+                if not rows:
+                    return []
+
+                await session.execute(
+                    update(jobs)
+                    .where(jobs.c.id.in_([r.id for r in rows]))
+                    .values(status="running", locked_at=func.now(6), attempts=jobs.c.attempts + 1)
+                )
+
+        return [Job(r.id, r.kind, r.payload or {}, r.attempts + 1, r.max_attempts) for r in rows]
+
+    async def complete(self, job: Job) -> None:
+        await self._update(job, status="done", locked_at=None, last_error=None)
+
+    async def retry(self, job: Job, error: str, delay: float) -> None:
+        await self._update(job, status="queued", locked_at=None, last_error=error, run_at=_after(delay))
+
+    async def fail(self, job: Job, error: str) -> None:
+        await self._update(job, status="failed", locked_at=None, last_error=error)
+
+    async def recover_stale(self, older_than: float) -> int:
+        stale = (jobs.c.status == "running", jobs.c.locked_at < _after(-older_than))
+        async with self._session_factory() as session:
+            async with session.begin():
+                failed = await session.execute(
+                    update(jobs)
+                    .where(*stale, jobs.c.attempts >= jobs.c.max_attempts)
+                    .values(status="failed", locked_at=None, last_error="Worker stopped while running the job")
+                )
+                requeued = await session.execute(
+                    update(jobs)
+                    .where(*stale)
+                    .values(status="queued", locked_at=None)
+                )
+        return failed.rowcount + requeued.rowcount
+
+    async def _update(self, job: Job, **values: Any) -> None:
+        async with self._session_factory() as session:
+            await session.execute(update(jobs).where(jobs.c.id == job.id).values(**values))
+            await session.commit()
+
+
+class InMemoryJobQueue(JobQueue):
+    """
+    Process-local job queue.
+
+    Jobs are lost on restart and only a worker running in the same process sees them,
+    so this is meant for development and tests (WORKER_BACKEND=memory).
+    """
+
+    def __init__(self, *, max_attempts: int = 5) -> None:
+        self._max_attempts = max_attempts
+        self._ids = itertools.count(1)
+        self._order = itertools.count()
+        self._heap: List[tuple] = []
+        self._wakeup = asyncio.Event()
+        self.failed: List[Job] = []
+
+    async def enqueue(self,
+                      kind: str,
+                      payload: Optional[Dict[str, Any]] = None,
+                      *,
+                      delay: float = 0.0,
+                      max_attempts: Optional[int] = None) -> Job:
+        job = Job(next(self._ids), kind, payload or {}, 0, max_attempts or self._max_attempts)
+        self._push(job, delay)
+        return job
+
+    async def claim(self, limit: int) -> List[Job]:
+        now = time.monotonic()
+        claimed: List[Job] = []
+        while self._heap and len(claimed) < limit and self._heap[0][0] <= now:
+            _, _, job = heapq.heappop(self._heap)
+            job.attempts += 1
+            claimed.append(job)
+        return claimed
+
+    async def complete(self, job: Job) -> None:
+        pass
+
+    async def retry(self, job: Job, error: str, delay: float) -> None:
+        self._push(job, delay)
+
+    async def fail(self, job: Job, error: str) -> None:
+        self.failed.append(job)
+
+    async def wait(self, timeout: float) -> None:
+        # Wake up early when something is enqueued, or when the next delayed job is due
+        if self._heap:
+            timeout = min(timeout, max(0.0, self._heap[0][0] - time.monotonic()))
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def _push(self, job: Job, delay: float) -> None:
+        heapq.heappush(self._heap, (time.monotonic() + max(0.0, delay), next(self._order), job))
+        self._wakeup.set()
+
+
+def create_job_queue(backend: str, session_factory: Callable[[], AsyncSession], *, max_attempts: int = 5) -> JobQueue:
+    if backend == "mysql":
+        return MySQLJobQueue(session_factory, max_attempts=max_attempts)
+    if backend == "memory":
+        return InMemoryJobQueue(max_attempts=max_attempts)
+    raise ValueError(f"Unknown worker backend '{backend}'")
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.session import SessionLocal
+from app.service_init import new_scope, resolve_service
+from app.worker.queue import Job, JobQueue
+
+
+class JobContext:
+    """Per-job context handed to task handlers: the job, its db session, and service resolution."""
+
+    def __init__(self,
+                 job: Job,
+                 db: AsyncSession,
+                 logger: logging.Logger,
+                 resolver: Callable[[str], Any]) -> None:
+        self.job = job
+        self.db = db
+        self.logger = logger
+        self._resolver = resolver
+
+    def resolve(self, service_id: str) -> Any:
+        """Resolve a service from the ServiceContainer, scoped to this job."""
+        return self._resolver(service_id)
+
+
+TaskHandler = Callable[[JobContext, Dict[str, Any]], Awaitable[Any]]
+
+# Registered task handlers by job kind
+_tasks: Dict[str, TaskHandler] = {}
+
+
+def task(kind: str) -> Callable[[TaskHandler], TaskHandler]:
+    """Register an async function as the handler for jobs of the given kind."""
+    def decorator(handler: TaskHandler) -> TaskHandler:
+        if kind in _tasks:
+            raise ValueError(f"Task '{kind}' already registered")
+        _tasks[kind] = handler
+        return handler
+    return decorator
+
+
+ScopeFactory = Callable[[AsyncSession, logging.Logger], Dict[str, Any]]
+ServiceResolver = Callable[[str, Dict[str, Any]], Any]
+
+
+class Worker:
+    """
+    Claims jobs from a JobQueue and runs them with bounded concurrency.
+
+    - Each job runs in its own db session, committed when the handler succeeds.
+    - Failed jobs are retried with exponential backoff until max_attempts, then marked failed.
+    - Services are resolved through the ServiceContainer with a per-job scope.
+    """
+
+    def __init__(self,
+                 queue: JobQueue,
+                 *,
+                 session_factory: Callable[[], AsyncSession],
+                 scope_factory: ScopeFactory,
+                 resolver: ServiceResolver,
+                 logger: logging.Logger,
+                 concurrency: int = 4,
+                 poll_interval: float = 1.0,
+                 retry_delay: float = 2.0,
+                 job_timeout: float = 300.0,
+                 tasks: Optional[Dict[str, TaskHandler]] = None) -> None:
+        self.queue = queue
+        self.logger = logger
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.job_timeout = job_timeout
+        self._session_factory = session_factory
+        self._scope_factory = scope_factory
+        self._resolver = resolver
+        self._tasks = _tasks if tasks is None else tasks
+        self._running: Set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+        self._last_recovery = 0.0
+
+    def stop(self) -> None:
+        """Stop claiming new jobs; run() returns once the running ones finish."""
+        self._stopping.set()
+
+    async def run(self, *, until_idle: bool = False) -> None:
+        """
+        Poll the queue until stop() is called.
+        With until_idle=True, return as soon as the queue is empty and no job is running.
+        """
+        self.logger.info(f"Worker started (concurrency={self.concurrency})")
+        try:
+            while not self._stopping.is_set():
+                await self._recover_stale()
+
+                claimed = []
+                free = self.concurrency - len(self._running)
+                if free > 0:
+                    try:
+                        claimed = await self.queue.claim(free)
+                    except Exception as e:
+                        self.logger.error(f"Error claiming jobs: {e}")
+
+                for job in claimed:
+                    t = asyncio.create_task(self._execute(job))
+                    self._running.add(t)
+                    t.add_done_callback(self._running.discard)
+
+                if claimed:
+                    continue
+                if until_idle and not self._running:
+                    break
+                await self._wait_for_work()
+        finally:
+            if self._running:
+                await asyncio.wait(self._running, timeout=self.job_timeout)
+            self.logger.info("Worker stopped")
+
+    async def _wait_for_work(self) -> None:
+        waiters = [asyncio.ensure_future(self.queue.wait(self.poll_interval)),
+                   asyncio.ensure_future(self._stopping.wait())]
+        if self._running and len(self._running) >= self.concurrency:
+            # At capacity: the next useful event is a job finishing
+            waiters.append(asyncio.ensure_future(asyncio.wait(set(self._running), return_when=asyncio.FIRST_COMPLETED)))
+        try:
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for w in waiters:
+                w.cancel()
+
+    async def _recover_stale(self) -> None:
+        # Jobs running longer than the timeout belong to a worker that died; check once a minute
+        now = time.monotonic()
+        if now - self._last_recovery < 60:
+            return
+        self._last_recovery = now
+        try:
+            count = await self.queue.recover_stale(self.job_timeout * 2)
+            if count:
+                self.logger.warning(f"Recovered {count} stale job(s)")
+        except Exception as e:
+            self.logger.error(f"Error recovering stale jobs: {e}")
+
+    async def _execute(self, job: Job) -> None:
+        handler = self._tasks.get(job.kind)
+        if handler is None:
+            self.logger.error(f"Job {job.id}: no task registered for '{job.kind}'")
+            await self._safely(self.queue.fail(job, f"Unknown task '{job.kind}'"))
+            return
+
+        started = time.perf_counter()
+        try:
+            async with self._session_factory() as db:
+                scope = self._scope_factory(db, self.logger)
+                ctx = JobContext(job, db, self.logger, lambda service_id: self._resolver(service_id, scope))
+                await asyncio.wait_for(handler(ctx, job.payload), self.job_timeout)
+                await db.commit()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if job.attempts >= job.max_attempts:
+                self.logger.error(f"Job {job.id} ({job.kind}) failed permanently after {job.attempts} attempt(s): {error}")
+                await self._safely(self.queue.fail(job, error))
+            else:
+                delay = self.retry_delay * 2 ** (job.attempts - 1)
+                self.logger.warning(f"Job {job.id} ({job.kind}) attempt {job.attempts} failed, retrying in {delay:.1f}s: {error}")
+                await self._safely(self.queue.retry(job, error, delay))
+            return
+
+        self.logger.info(f"Job {job.id} ({job.kind}) done in {time.perf_counter() - started:.3f}s")
+        await self._safely(self.queue.complete(job))
+
+    async def _safely(self, op: Awaitable[None]) -> None:
+        try:
+            await op
+        except Exception as e:
+            # The job stays 'running' and is picked up again by stale recovery
+            self.logger.error(f"Error updating job state: {e}")
+
+
+def create_worker(queue: JobQueue, logger: logging.Logger) -> Worker:
+    """Build a Worker wired to the app's settings, db sessions and ServiceContainer."""
+    return Worker(
+        queue,
+        session_factory=SessionLocal,
+        scope_factory=new_scope,
+        resolver=resolve_service,
+        logger=logger,
+        concurrency=settings.worker_concurrency,
+        poll_interval=settings.worker_poll_interval,
+        retry_delay=settings.worker_retry_delay,
+        job_timeout=settings.worker_job_timeout,
+    )
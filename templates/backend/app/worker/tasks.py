@@ -0,0 +1,17 @@
+"""
+Background task handlers.
+
+Register a handler with @task("<kind>") and enqueue work from a route with
+`await job_queue.enqueue("<kind>", {...})`. Handlers get a JobContext and the job payload;
+services are resolved through the ServiceContainer exactly as in request handlers.
+"""
+from app.services.utility_service import UtilityService
+from app.worker.runner import JobContext, task
+
+
+@task("log_database_version")
+async def log_database_version(ctx: JobContext, payload: dict) -> None:
+    """Example task: look up the database version via UtilityService and log it."""
+    utility_service: UtilityService = ctx.resolve("utility")
+    version = await utility_service.get_database_version()
+    ctx.logger.info(f"Job {ctx.job.id}: database version is {version} (requested by {payload.get('requested_by', 'unknown')})")
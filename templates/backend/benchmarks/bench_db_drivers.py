@@ -0,0 +1,82 @@
+"""
+Compare the async MySQL drivers on the same database.
+
+- Round trips: many tiny queries from concurrent connections (protocol and event-loop overhead)
+- Row decode: one large result with mixed column types (CPU spent turning packets into rows)
+
+Run inside the backend container, from the project root:
+
+    python -m benchmarks.bench_db_drivers --queries 5000 --rows 100000
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.db.url import ASYNC_DRIVERS, async_database_url
+
+ROWS_QUERY = text("""
+    WITH RECURSIVE seq (n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < :rows)
+    SELECT n,
+           CONCAT('row-', n) AS label,
+           TIMESTAMPADD(SECOND, n, '2024-01-01 00:00:00') AS created_at,
+           CAST(n / 7 AS DECIMAL(12, 4)) AS amount,
+           n * 1.5 AS ratio,
+           NULL AS missing
+    FROM seq
+""")
+
+
+async def bench_driver(url: str, driver: str, queries: int, rows: int, concurrency: int) -> Dict[str, float]:
+    engine = create_async_engine(async_database_url(url, driver), pool_size=concurrency, max_overflow=0)
+    try:
+        # Round trips: `concurrency` connections issuing SELECT 1 in a loop
+        async def worker(n: int) -> None:
+            async with engine.connect() as conn:
+                for _ in range(n):
+                    await conn.execute(text("SELECT 1"))
+
+        await asyncio.gather(*(worker(1) for _ in range(concurrency)))  # open the connections first
+        per_worker = max(1, queries // concurrency)
+        wall, cpu = time.perf_counter(), time.process_time()
+        await asyncio.gather(*(worker(per_worker) for _ in range(concurrency)))
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        total = per_worker * concurrency
+        result = {"qps": total / wall, "cpu_us_per_query": cpu / total * 1e6}
+
+        # Row decode: one connection fetching a large generated result
+        async with engine.connect() as conn:
+            await conn.execute(text("SET SESSION cte_max_recursion_depth = :depth"), {"depth": rows + 1})
+            wall, cpu = time.perf_counter(), time.process_time()
+            fetched = (await conn.execute(ROWS_QUERY, {"rows": rows})).all()
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        result.update(rows_per_s=len(fetched) / wall, cpu_us_per_row=cpu / len(fetched) * 1e6)
+        return result
+    finally:
+        await engine.dispose()
+
+
+async def main(args: argparse.Namespace) -> None:
+    print(f"{'driver':<10} {'queries/s':>10} {'cpu µs/query':>13} {'rows/s':>10} {'cpu µs/row':>11}")
+    for driver in args.drivers:
+        try:
+            r = await bench_driver(args.url, driver, args.queries, args.rows, args.concurrency)
+        except ImportError as e:
+            print(f"{driver:<10} not installed ({e.name})")
+            continue
+        print(f"{driver:<10} {r['qps']:>10.0f} {r['cpu_us_per_query']:>13.1f} "
+              f"{r['rows_per_s']:>10.0f} {r['cpu_us_per_row']:>11.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=settings.database_url)
+    parser.add_argument("--drivers", nargs="+", default=list(ASYNC_DRIVERS), choices=ASYNC_DRIVERS)
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,91 @@
+"""
+CPU time and memory per request for turning 10k rows into a JSON list response.
+
+- pydantic: a JobResponse model per row, then Page.model_dump_json() (the usual route pattern)
+- records:  RecordType slots records serialized with orjson (app.core.records)
+
+Rows come from an in-memory SQLite copy of the jobs columns, so no database is needed:
+
+    python -m benchmarks.bench_row_pipeline --rows 10000
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, Text, create_engine, insert
+from sqlalchemy.engine import Row
+
+from app.core.records import RecordType
+from app.schemas.job_schema import JobResponse
+from app.schemas.page_schema import Page
+
+metadata = MetaData()
+jobs = Table("jobs", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("kind", String(100), nullable=False),
+    Column("status", String(16), nullable=False),
+    Column("attempts", Integer, nullable=False),
+    Column("max_attempts", Integer, nullable=False),
+    Column("last_error", Text, nullable=True),
+    Column("run_at", DateTime, nullable=False),
+    Column("created_at", DateTime, nullable=False))
+
+RECORDS = RecordType(JobResponse, jobs)
+
+
+def load_rows(n: int) -> List[Row]:
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(jobs), [
+            {"kind": f"kind-{i % 7}", "status": "done", "attempts": i % 5, "max_attempts": 5,
+             "last_error": None if i % 3 else "timeout", "run_at": start + timedelta(seconds=i),
+             "created_at": start + timedelta(microseconds=i)}
+            for i in range(n)
+        ])
+        return conn.execute(RECORDS.select()).all()
+
+
+def via_pydantic(rows: List[Row]) -> bytes:
+    page = Page[JobResponse](items=[JobResponse.model_validate(r._mapping) for r in rows], next_cursor="x")
+    return page.model_dump_json().encode()
+
+
+def via_records(rows: List[Row]) -> bytes:
+    return RECORDS.dumps({"items": RECORDS.from_rows(rows), "next_cursor": "x"})
+
+
+def measure(fn: Callable[[List[Row]], bytes], rows: List[Row], repeat: int) -> dict:
+    fn(rows)  # warm up
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.process_time()
+        body = fn(rows)
+        best = min(best, time.process_time() - started)
+    tracemalloc.start()
+    fn(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"cpu_ms": best * 1000, "peak_kb": peak / 1024, "bytes": len(body)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    rows = load_rows(args.rows)
+    print(f"{args.rows} rows per request, best of {args.repeat}")
+    print(f"{'pipeline':<10} {'cpu ms':>8} {'µs/row':>7} {'peak mem kB':>12} {'body kB':>8}")
+    for name, fn in (("pydantic", via_pydantic), ("records", via_records)):
+        r = measure(fn, rows, args.repeat)
+        print(f"{name:<10} {r['cpu_ms']:>8.1f} {r['cpu_ms'] * 1000 / args.rows:>7.2f} "
+              f"{r['peak_kb']:>12.0f} {r['bytes'] / 1024:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
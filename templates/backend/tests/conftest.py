@@ -2,7 +2,8 @@ import pytest
 import pytest_asyncio
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from app.db.tables import metadata
-from app.db.session import db_session, clean_database_url
+from app.db.session import db_session
+from app.db.url import async_database_url
 from app.main import app
 from app.service_init import get_utility_service
 from app.config import Settings, settings
@@ -25,8 +26,8 @@ def settings_factory():
 @pytest_asyncio.fixture(scope="module")
 async def engine():
     """Create async engine within the event loop context."""
-    # Clean the URL to remove unsupported parameters like ssl_disabled
-    database_url = clean_database_url(settings.database_url)
+    # Same driver and URL normalization as the app's engine
+    database_url = async_database_url(settings.database_url, settings.db_driver)
     
     # Create engine within the event loop context
     eng = create_async_engine(
@@ -0,0 +1,104 @@
+import asyncio
+import pytest
+from app.core.admission import AdmissionGate, AdmissionControlMiddleware, split_capacity
+
+
+@pytest.mark.asyncio
+async def test_gate_admits_in_order_up_to_limit():
+    """Test that queued requests are admitted in arrival order as slots are released."""
+    gate = AdmissionGate("default", limit=1, max_queue=5)
+    assert await gate.acquire(1.0) is None
+
+    admitted = []
+
+    async def waiter(n):
+        assert await gate.acquire(1.0) is None
+        admitted.append(n)
+
+    tasks = [asyncio.create_task(waiter(n)) for n in range(3)]
+    await asyncio.sleep(0)
+    assert gate.queued == 3
+
+    for _ in range(3):
+        gate.release()
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+
+    assert admitted == [0, 1, 2]
+    assert gate.inflight == 1
+
+
+@pytest.mark.asyncio
+async def test_gate_sheds_when_queue_full_or_timed_out():
+    """Test the rejection reasons: full queue, expired wait, and no time left at all."""
+    gate = AdmissionGate("default", limit=1, max_queue=1)
+    assert await gate.acquire(1.0) is None
+
+    pending = asyncio.create_task(gate.acquire(0.05))
+    await asyncio.sleep(0)
+    assert await gate.acquire(1.0) == "queue_full"
+    assert await pending == "timeout"
+    assert gate.queued == 0
+    assert await gate.acquire(0) == "deadline"
+
+    gate.release()
+    assert gate.inflight == 0
+
+
+@pytest.mark.asyncio
+async def test_middleware_returns_503_with_retry_after():
+    """Test that requests beyond the limit and queue are rejected with 503 and Retry-After."""
+    release = asyncio.Event()
+
+    async def slow_app(scope, receive, send):
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    middleware = AdmissionControlMiddleware(
+        slow_app, capacity=1, max_queue=0, queue_timeout=1.0, retry_after=3, exempt_paths=["/metrics"]
+    )
+
+    async def call(path):
+        scope = {"type": "http", "method": "GET", "path": path, "headers": []}
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        await middleware(scope, receive, send)
+        return sent[0]
+
+    first = asyncio.create_task(call("/api/slow"))
+    await asyncio.sleep(0)
+
+    rejected = await call("/api/slow")
+    assert rejected["status"] == 503
+    assert (b"retry-after", b"3") in rejected["headers"]
+
+    exempt = asyncio.create_task(call("/metrics"))
+    release.set()
+    assert (await first)["status"] == 200
+    assert (await exempt)["status"] == 200
+
+
+def test_route_class_limits_never_exceed_capacity():
+    """Test that classes without a limit share the capacity left, and over-committed limits are refused."""
+    assert split_capacity(15, ["default", "reports"], {}) == {"default": 8, "reports": 7}
+    assert split_capacity(15, ["default", "reports", "exports"], {"reports": 2}) == {
+        "reports": 2, "default": 7, "exports": 6,
+    }
+    assert split_capacity(15, ["default"], {"default": 10}) == {"default": 10}
+
+    middleware = AdmissionControlMiddleware(
+        None, capacity=15, limits={"reports": 2}, route_classes={"/api/reports": "reports", "/api/x": "x"}
+    )
+    assert sum(gate.limit for gate in middleware.gates.values()) == 15
+
+    with pytest.raises(ValueError):
+        split_capacity(15, ["default", "reports"], {"reports": 15})
+    with pytest.raises(ValueError):
+        split_capacity(15, ["default"], {"default": 20})
@@ -0,0 +1,33 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.main import app
+from app.service_init import get_job_service
+from app.services.job_service import JobService
+
+
+def test_batch_dispatches_gets_in_process():
+    """Test that each item gets the status and body a standalone GET would, in request order."""
+    # A bad cursor is rejected before any query, so an unbound session will do
+    app.dependency_overrides[get_job_service] = lambda: JobService(AsyncSession())
+    try:
+        client = TestClient(app)
+        response = client.post("/api/batch", json={"requests": [
+            {"path": "/api/jobs?cursor=not-a-cursor"},
+            {"path": "/api/jobs?limit=0"},
+            {"path": "/api/missing"},
+            {"path": "/api/%6Aobs?cursor=not-a-cursor"},
+        ]})
+    finally:
+        del app.dependency_overrides[get_job_service]
+
+    assert response.status_code == 200
+    statuses = [item["status"] for item in response.json()["responses"]]
+    assert statuses == [400, 422, 404, 400]
+    assert response.json()["responses"][0]["body"] == {"detail": "Invalid cursor"}
+
+
+def test_batch_rejects_foreign_and_nested_paths():
+    """Test that only API GETs can be batched, and not the batch endpoint itself."""
+    client = TestClient(app)
+    for path in ["/healthz", "/api/batch", "/api/%62atch"]:
+        assert client.post("/api/batch", json={"requests": [{"path": path}]}).status_code == 400
@@ -0,0 +1,17 @@
+import pytest
+from app.db.url import async_database_url, sync_database_url
+
+URL = "mysql+aiomysql://root:p%40ss@db:3306/app?ssl_disabled=true&charset=utf8mb4"
+
+
+def test_async_url_switches_driver_and_drops_unsupported_params():
+    """Test that the configured driver replaces the URL's and ssl_disabled is removed."""
+    assert async_database_url(URL) == "mysql+aiomysql://root:p%40ss@db:3306/app?charset=utf8mb4"
+    assert async_database_url(URL, "asyncmy") == "mysql+asyncmy://root:p%40ss@db:3306/app?charset=utf8mb4"
+    with pytest.raises(ValueError):
+        async_database_url(URL, "mysqlconnector")
+
+
+def test_sync_url_uses_sync_driver():
+    """Test that Alembic gets the same database through mysql-connector."""
+    assert sync_database_url(URL) == "mysql+mysqlconnector://root:p%40ss@db:3306/app?charset=utf8mb4"
@@ -0,0 +1,125 @@
+import asyncio
+import pytest
+from sqlalchemy import create_engine, event, text
+from app.core.admission import admission_wait_var
+from app.core.deadline import DeadlineMiddleware, _statements_var, deadline, install_statement_deadlines
+from app.core.metrics import metrics
+
+
+async def _call(middleware, path="/api/slow", headers=()):
+    scope = {"type": "http", "method": "GET", "path": path, "headers": list(headers)}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await middleware(scope, receive, send)
+    return sent[0]["status"] if sent else None
+
+
+@pytest.mark.asyncio
+async def test_slow_request_gets_504_and_header_can_only_shorten():
+    """Test the per-prefix timeout, the client header and the timeout counter."""
+    async def app(scope, receive, send):
+        await asyncio.sleep(0.2)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    middleware = DeadlineMiddleware(app, default_timeout=1.0, timeouts={"/api/slow": 0.05})
+    before = metrics.counter_value("request_timeouts_total", route="/api/slow")
+
+    assert await _call(middleware) == 504
+    assert await _call(middleware, "/api/other") == 200
+    assert await _call(middleware, "/api/other", [(b"x-request-timeout", b"0.05")]) == 504
+    assert await _call(middleware, "/api/slow", [(b"x-request-timeout", b"5")]) == 504
+    assert metrics.counter_value("request_timeouts_total", route="/api/slow") == before + 2
+
+    # The header budget is end to end: time spent queueing for admission is taken off it
+    token = admission_wait_var.set(0.25)
+    try:
+        assert await _call(middleware, "/api/other", [(b"x-request-timeout", b"0.3")]) == 504
+    finally:
+        admission_wait_var.reset(token)
+    assert await _call(middleware, "/api/other", [(b"x-request-timeout", b"0.3")]) == 200
+
+
+@pytest.mark.asyncio
+async def test_running_statement_is_killed_before_cancelling():
+    """Test that at the deadline the request's statements are killed and the resulting error becomes 504."""
+    killed = []
+    handler_cancelled = False
+
+    class QueryInterrupted(Exception):
+        pass
+
+    async def kill_queries(statements):
+        # Give the finished statement time to drop out of the live mapping
+        await asyncio.sleep(0.01)
+        killed.extend(statements)
+        interrupted.set()
+        return len(killed)
+
+    interrupted = asyncio.Event()
+
+    async def app(scope, receive, send):
+        nonlocal handler_cancelled
+        statements = _statements_var.get()
+        statements[42] = "deadline-1"  # as the cursor hook does for a running statement
+        statements[43] = "deadline-2"
+        asyncio.get_running_loop().call_later(0.055, statements.pop, 43)  # finishes right at the deadline
+        try:
+            await interrupted.wait()
+        except asyncio.CancelledError:
+            handler_cancelled = True
+            raise
+        raise QueryInterrupted(1317, "Query execution was interrupted")
+
+    middleware = DeadlineMiddleware(app, default_timeout=0.05, kill_queries=kill_queries, kill_grace=1.0)
+    assert await _call(middleware) == 504
+    assert killed == [42]
+    assert not handler_cancelled
+
+
+def test_selects_get_max_execution_time_hint_only_under_a_deadline():
+    """Test the MAX_EXECUTION_TIME hint injection."""
+    engine = create_engine("sqlite://")
+    install_statement_deadlines(engine)
+    executed = []
+    event.listen(engine, "after_cursor_execute", lambda conn, cur, stmt, *a: executed.append(stmt))
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        with deadline(5):
+            conn.execute(text("SELECT 2"))
+            conn.execute(text("CREATE TABLE t (id INTEGER)"))
+
+    assert executed[0] == "SELECT 1"
+    assert executed[1].startswith("SELECT /*+ MAX_EXECUTION_TIME(") and executed[1].endswith(" 2")
+    assert "deadline-" not in executed[1]  # statements are only tagged while a request tracks them
+    assert "MAX_EXECUTION_TIME" not in executed[2]
+
+
+def test_tracked_statements_are_tagged_for_the_kill():
+    """Test that statements of a request are recorded by connection id with their tag until they finish."""
+    engine = create_engine("sqlite://")
+    install_statement_deadlines(engine)
+    seen = {}
+    event.listen(engine, "before_cursor_execute", lambda *a: seen.update(statements))
+    event.listen(engine, "after_cursor_execute", lambda conn, cur, stmt, *a: seen.update(stmt=stmt))
+
+    statements = {}
+    token = _statements_var.set(statements)
+    try:
+        with engine.connect() as conn:
+            conn.info["mysql_thread_id"] = 7
+            with deadline(5):
+                conn.execute(text("SELECT 1"))
+    finally:
+        _statements_var.reset(token)
+
+    tag = seen[7]
+    assert tag.startswith("deadline-") and seen["stmt"].endswith(f" 1 /* {tag} */")
+    assert statements == {}
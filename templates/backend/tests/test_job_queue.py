@@ -0,0 +1,118 @@
+import pytest
+from sqlalchemy import delete, select
+from app.db.tables import jobs
+from app.service_init import new_scope, resolve_service
+from app.worker.queue import InMemoryJobQueue, MySQLJobQueue
+from app.worker.runner import Worker
+
+
+def make_worker(queue, session_factory, logger, tasks):
+    return Worker(
+        queue,
+        session_factory=session_factory,
+        scope_factory=new_scope,
+        resolver=resolve_service,
+        logger=logger,
+        concurrency=2,
+        poll_interval=0.05,
+        retry_delay=0,
+        tasks=tasks,
+    )
+
+
+@pytest.mark.asyncio
+async def test_worker_retries_then_fails(TestingSessionLocal, test_logger):
+    """
+    Test that a failing job is retried up to max_attempts and then marked failed,
+    while other jobs complete normally.
+    """
+    calls = {"ok": 0, "flaky": 0}
+
+    async def ok(ctx, payload):
+        calls["ok"] += 1
+
+    async def flaky(ctx, payload):
+        calls["flaky"] += 1
+        raise RuntimeError("boom")
+
+    queue = InMemoryJobQueue(max_attempts=3)
+    await queue.enqueue("ok")
+    await queue.enqueue("flaky")
+    await queue.enqueue("missing")
+
+    worker = make_worker(queue, TestingSessionLocal, test_logger, {"ok": ok, "flaky": flaky})
+    await worker.run(until_idle=True)
+
+    assert calls == {"ok": 1, "flaky": 3}
+    assert sorted(job.kind for job in queue.failed) == ["flaky", "missing"]
+    assert len(queue) == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_resolves_services(TestingSessionLocal, test_logger):
+    """Test that task handlers can resolve scoped services through the ServiceContainer."""
+    versions = []
+
+    async def lookup(ctx, payload):
+        versions.append(await ctx.resolve("utility").get_database_version())
+
+    queue = InMemoryJobQueue()
+    await queue.enqueue("lookup")
+
+    worker = make_worker(queue, TestingSessionLocal, test_logger, {"lookup": lookup})
+    await worker.run(until_idle=True)
+
+    assert len(versions) == 1 and versions[0]
+
+
+@pytest.mark.asyncio
+async def test_mysql_queue_claims_each_job_once(setup_db, TestingSessionLocal):
+    """Test that MySQL-backed claims never hand out the same job twice."""
+    queue = MySQLJobQueue(TestingSessionLocal, max_attempts=2)
+    try:
+        for i in range(3):
+            await queue.enqueue("ok", {"n": i})
+        await queue.enqueue("later", delay=3600)
+
+        first = await queue.claim(2)
+        second = await queue.claim(10)
+
+        assert [j.payload["n"] for j in first] == [0, 1]
+        assert [j.payload["n"] for j in second] == [2]
+        assert all(j.attempts == 1 for j in first + second)
+
+        await queue.complete(first[0])
+        await queue.retry(first[1], "boom", delay=0)
+        await queue.fail(second[0], "boom")
+
+        async with TestingSessionLocal() as session:
+            rows = (await session.execute(select(jobs.c.kind, jobs.c.status).order_by(jobs.c.id))).all()
+        assert [r.status for r in rows] == ["done", "queued", "failed", "queued"]
+
+        retried = await queue.claim(10)
+        assert [j.id for j in retried] == [first[1].id]
+        assert retried[0].attempts == 2
+    finally:
+        async with TestingSessionLocal() as session:
+            await session.execute(delete(jobs))
+            await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_mysql_queue_fails_stale_jobs_out_of_attempts(setup_db, TestingSessionLocal):
+    """Test that stale running jobs are requeued only while they have attempts left."""
+    queue = MySQLJobQueue(TestingSessionLocal, max_attempts=1)
+    try:
+        await queue.enqueue("crashes")
+        await queue.enqueue("crashes", max_attempts=2)
+        assert len(await queue.claim(10)) == 2
+
+        assert await queue.recover_stale(-1) == 2
+
+        async with TestingSessionLocal() as session:
+            rows = (await session.execute(select(jobs.c.status).order_by(jobs.c.id))).all()
+        assert [r.status for r in rows] == ["failed", "queued"]
+    finally:
+        async with TestingSessionLocal() as session:
+            await session.execute(delete(jobs))
+            await session.commit()
@@ -0,0 +1,86 @@
+import asyncio
+import pytest
+from sqlalchemy import delete, event, insert
+from app.db.loader import DataLoader, Loaders
+from app.db.tables import jobs
+
+
+@pytest.mark.asyncio
+async def test_loader_batches_and_dedupes_keys():
+    """Test that loads issued in the same tick are resolved by one deduplicated batch call."""
+    batches = []
+
+    async def batch_fn(keys):
+        batches.append(list(keys))
+        return {k: k * 10 for k in keys if k != 3}
+
+    loader = DataLoader(batch_fn)
+    results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1), loader.load(3))
+
+    assert results == [10, 20, 10, None]
+    assert batches == [[1, 2, 3]]
+
+    # Cached keys are served without another batch
+    assert await loader.load_many([2, 1]) == [20, 10]
+    assert len(batches) == 1
+
+
+@pytest.mark.asyncio
+async def test_loader_survives_cancelled_callers():
+    """Test that a cancelled caller doesn't fail the key for others, and a cancelled batch isn't cached."""
+    release = asyncio.Event()
+    batches = []
+    running = []
+
+    async def batch_fn(keys):
+        batches.append(list(keys))
+        running.append(asyncio.current_task())
+        await release.wait()
+        return {k: k * 10 for k in keys}
+
+    loader = DataLoader(batch_fn)
+    first = asyncio.ensure_future(loader.load(1))
+    second = asyncio.ensure_future(loader.load(1))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+    assert await second == 10
+    assert first.cancelled()
+
+    # The batch itself is cancelled (e.g. shutdown): its waiter is cancelled, the key not cached
+    release.clear()
+    waiter = asyncio.ensure_future(loader.load(2))
+    await asyncio.sleep(0.01)
+    running[-1].cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    release.set()
+    assert await loader.load(2) == 20
+    assert batches == [[1], [2], [2]]
+
+
+@pytest.mark.asyncio
+async def test_table_loader_issues_single_in_query(setup_db, engine, test_db_session):
+    """Test that N lookups against a metadata table become one WHERE id IN (...) query."""
+    await test_db_session.execute(insert(jobs), [{"kind": f"job-{i}", "payload": {}} for i in range(5)])
+    await test_db_session.commit()
+    ids = [r.id for r in (await test_db_session.execute(jobs.select().order_by(jobs.c.id))).all()]
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        loader = Loaders(test_db_session).table("jobs")
+        rows = await asyncio.gather(*(loader.load(i) for i in ids + ids[:2] + [-1]))
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+        await test_db_session.execute(delete(jobs))
+        await test_db_session.commit()
+
+    assert [r.kind for r in rows[:5]] == [f"job-{i}" for i in range(5)]
+    assert rows[-1] is None
+    assert len(statements) == 1 and " IN " in statements[0]
@@ -0,0 +1,52 @@
+from datetime import datetime
+from decimal import Decimal
+import pytest
+from sqlalchemy import delete, insert, select
+from app.db.pagination import Keyset, decode_cursor, encode_cursor, fetch_page
+from app.db.tables import jobs
+from app.exceptions import InvalidInputError
+
+KEYSET = Keyset(jobs.c.created_at.desc(), jobs.c.id.desc())
+
+
+def test_cursor_round_trips_and_rejects_foreign_cursors():
+    """Test that cursor values survive encoding exactly and cursors are tied to their keyset."""
+    values = (datetime(2024, 5, 1, 12, 30, 0, 123456), 42)
+    assert decode_cursor(KEYSET, encode_cursor(KEYSET, values)) == values
+
+    other = Keyset(jobs.c.kind, jobs.c.attempts, jobs.c.id)
+    assert decode_cursor(other, encode_cursor(other, ("x", Decimal("1.50"), 7))) == ("x", Decimal("1.50"), 7)
+    with pytest.raises(InvalidInputError):
+        decode_cursor(KEYSET, encode_cursor(other, ("x", 1, 7)))
+    with pytest.raises(InvalidInputError):
+        decode_cursor(KEYSET, "not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_pages_cover_every_row_once_with_ties(setup_db, test_db_session):
+    """Test that walking the pages returns each row exactly once, in order, even with equal sort values."""
+    same_time = datetime(2024, 1, 1)
+    await test_db_session.execute(insert(jobs), [
+        {"kind": f"job-{i}", "payload": {}, "created_at": same_time if i % 2 else datetime(2024, 1, 1, 0, 0, i)}
+        for i in range(11)
+    ])
+    await test_db_session.commit()
+
+    try:
+        stmt = select(jobs.c.id, jobs.c.created_at)
+        expected = [tuple(r) for r in (await test_db_session.execute(stmt.order_by(*KEYSET.order_by))).all()]
+
+        seen, cursor, pages = [], None, 0
+        while True:
+            page = await fetch_page(test_db_session, stmt, KEYSET, limit=4, cursor=cursor)
+            seen.extend(tuple(r) for r in page.rows)
+            pages += 1
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+    finally:
+        await test_db_session.execute(delete(jobs))
+        await test_db_session.commit()
+
+    assert seen == expected
+    assert pages == 3
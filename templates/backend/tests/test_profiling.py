@@ -0,0 +1,90 @@
+import asyncio
+import json
+import time
+import pytest
+from sqlalchemy import create_engine, text
+from app.core.deadline import _statements_var, deadline, install_statement_deadlines
+from app.core.profiling import Profiler, ProfilingMiddleware, SQLTimer, StackSampler, dump_tasks
+from app.exceptions import ProfilerBusyError
+
+
+def _busy_loop(seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+
+def test_sampler_outputs_collapsed_and_speedscope():
+    """Test that a busy function shows up in both output formats."""
+    sampler = StackSampler(interval=0.001)
+    sampler.start()
+    _busy_loop(0.1)
+    sampler.stop()
+
+    assert sampler.samples > 0
+    assert "_busy_loop (" in sampler.collapsed()
+
+    profile = json.loads(json.dumps(sampler.speedscope()))
+    names = {frame["name"] for frame in profile["shared"]["frames"]}
+    assert "_busy_loop" in names
+    assert all(p["type"] == "sampled" and len(p["samples"]) == len(p["weights"]) for p in profile["profiles"])
+
+
+def test_sql_timer_listens_only_while_started():
+    """Test per-statement timing and that the listeners are removed again."""
+    engine = create_engine("sqlite://")
+    timer = SQLTimer(engine)
+    timer.start()
+    with engine.connect() as conn:
+        for _ in range(3):
+            conn.execute(text("SELECT 1"))
+    timer.stop()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    [row] = timer.report()
+    assert row["statement"] == "SELECT 1"
+    assert row["count"] == 3
+
+
+def test_sql_timer_aggregates_statements_rewritten_by_deadlines():
+    """Test that deadline hints and kill tags, different on every run, don't split the timer's entries."""
+    engine = create_engine("sqlite://")
+    install_statement_deadlines(engine)
+    timer = SQLTimer(engine)
+    timer.start()
+    token = _statements_var.set({})
+    try:
+        with engine.connect() as conn:
+            conn.info["mysql_thread_id"] = 7
+            for _ in range(3):
+                with deadline(30):
+                    conn.execute(text("SELECT 1"))
+    finally:
+        _statements_var.reset(token)
+        timer.stop()
+
+    [row] = timer.report()
+    assert row["statement"] == "SELECT 1"
+    assert row["count"] == 3
+
+@pytest.mark.asyncio
+async def test_request_mode_session_profiles_next_matching_requests():
+    """Test that a request-mode session covers only the next N matching requests, then finishes."""
+    profiler = Profiler()
+
+    async def app(scope, receive, send):
+        await asyncio.sleep(0.01)
+
+    middleware = ProfilingMiddleware(app, profiler)
+    session = profiler.start(seconds=5, requests=2, path="/api/slow", interval=0.001)
+    with pytest.raises(ProfilerBusyError):
+        profiler.start(seconds=1)
+
+    for path in ["/api/other", "/api/slow", "/api/slow", "/api/slow"]:
+        await middleware({"type": "http", "path": path}, None, None)
+
+    assert not session.running
+    assert session.claimed == 2
+    assert not profiler.watching
+    assert any(t["current"] for t in dump_tasks())
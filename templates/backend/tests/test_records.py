@@ -0,0 +1,67 @@
+import json
+from datetime import datetime
+from typing import Optional
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, Text, create_engine, insert
+from app.core.records import RecordType
+from app.db.tables import jobs
+from app.schemas.job_schema import JobResponse
+
+# Same shape as `jobs`, on SQLite so no MySQL is needed
+_metadata = MetaData()
+_jobs = Table("jobs", _metadata,
+    Column("id", Integer, primary_key=True),
+    Column("kind", String(100), nullable=False),
+    Column("status", String(16), nullable=False),
+    Column("attempts", Integer, nullable=False),
+    Column("max_attempts", Integer, nullable=False),
+    Column("last_error", Text, nullable=True),
+    Column("run_at", DateTime, nullable=False),
+    Column("created_at", DateTime, nullable=False))
+
+
+def test_records_serialize_like_the_pydantic_model():
+    """Test that the fast path produces the same JSON as validating and dumping the model."""
+    records = RecordType(JobResponse, _jobs)
+    engine = create_engine("sqlite://")
+    _metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(_jobs), [
+            {"kind": "k", "status": "failed" if i % 2 else "done", "attempts": i, "max_attempts": 5,
+             "last_error": "boom" if i % 2 else None, "run_at": datetime(2024, 1, 1, 0, 0, i, 5),
+             "created_at": datetime(2024, 1, 1)}
+            for i in range(5)
+        ])
+        rows = conn.execute(records.select()).all()
+
+    expected = [json.loads(JobResponse.model_validate(r._mapping).model_dump_json()) for r in rows]
+    assert json.loads(records.dumps(records.from_rows(rows))) == expected
+    assert not hasattr(records.from_rows(rows)[0], "__dict__")
+
+
+def test_mismatched_schema_fails_at_definition():
+    """Test that missing columns, wrong types and nullability are caught once, up front."""
+    RecordType(JobResponse, jobs)
+
+    class Missing(BaseModel):
+        id: int
+        nickname: str
+
+    class WrongType(BaseModel):
+        id: int
+        kind: int
+
+    class NotOptional(BaseModel):
+        id: int
+        last_error: str
+
+    for model in (Missing, WrongType, NotOptional):
+        with pytest.raises(TypeError):
+            RecordType(model, jobs)
+
+    class Fine(BaseModel):
+        id: int
+        last_error: Optional[str] = None
+
+    assert RecordType(Fine, jobs).fields == ("id", "last_error")
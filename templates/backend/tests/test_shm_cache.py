@@ -0,0 +1,89 @@
+import multiprocessing
+import time
+from datetime import datetime
+import pytest
+from app.core.shm_cache import SharedMemoryCache
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache")
+
+
+def _child_set(path):
+    cache = SharedMemoryCache(path, slots=64, slot_size=256, ways=4)
+    cache.set("from-child", b"hello")
+    cache.close()
+
+
+def test_set_get_delete(cache_path):
+    """Test basic set/get/delete and that oversized values are refused."""
+    cache = SharedMemoryCache(cache_path, slots=64, slot_size=256, ways=4)
+    assert cache.get("missing") is None
+    assert cache.set("a", b"1")
+    assert cache.set_json("b", {"x": [1, 2]})
+    assert cache.get("a") == b"1"
+    assert cache.get_json("b") == {"x": [1, 2]}
+
+    assert cache.set("a", b"2")
+    assert cache.get("a") == b"2"
+    assert cache.delete("a")
+    assert cache.get("a") is None
+
+    assert not cache.set("big", b"x" * 1024)
+    assert cache.get("big") is None
+
+
+def test_ttl_and_lru_eviction(cache_path):
+    """Test that expired entries are misses and a full set evicts its least recently used slot."""
+    cache = SharedMemoryCache(cache_path, slots=2, slot_size=256, ways=2)
+    cache.set("short", b"x", ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("short") is None
+
+    cache.set("k1", b"1")
+    time.sleep(0.001)
+    cache.set("k2", b"2")
+    time.sleep(0.001)
+    cache.get("k1")  # k2 is now least recently used
+    time.sleep(0.001)
+    cache.set("k3", b"3")
+
+    assert cache.get("k1") == b"1"
+    assert cache.get("k2") is None
+    assert cache.get("k3") == b"3"
+
+
+def test_shared_between_processes(cache_path):
+    """Test that a value written by another process is visible without reopening."""
+    cache = SharedMemoryCache(cache_path, slots=64, slot_size=256, ways=4)
+    process = multiprocessing.get_context("fork").Process(target=_child_set, args=(cache_path,))
+    process.start()
+    process.join(10)
+
+    assert process.exitcode == 0
+    assert cache.get("from-child") == b"hello"
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_returns_json_values_on_miss_and_hit(cache_path):
+    """Test that a miss returns the same JSON round-tripped value a later hit does."""
+    cache = SharedMemoryCache(cache_path, slots=64, slot_size=256, ways=4)
+
+    async def loader():
+        return {"at": datetime(2024, 1, 2, 3, 4, 5)}
+
+    miss = await cache.get_or_load("k", loader)
+    hit = await cache.get_or_load("k", loader)
+    assert miss == hit == {"at": "2024-01-02 03:04:05"}
+
+
+def test_other_layout_gets_its_own_file(cache_path):
+    """Test that reopening with another layout leaves the mapped file of the first one intact."""
+    cache = SharedMemoryCache(cache_path, slots=64, slot_size=256, ways=4)
+    cache.set("a", b"1")
+    other = SharedMemoryCache(cache_path, slots=128, slot_size=512, ways=4)
+
+    assert other.path != cache.path
+    assert other.get("a") is None
+    assert cache.get("a") == b"1"
@@ -0,0 +1,62 @@
+import asyncio
+import logging
+import pytest
+from sqlalchemy import text
+from app.db import warmup
+from app.db.warmup import Readiness, warm_pool, warm_up
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_leaves_connections_idle_in_pool(engine):
+    """Test that warm-up opens the requested connections concurrently and returns them to the pool."""
+    pool = engine.sync_engine.pool
+    before = pool.checkedin()
+
+    opened = await warm_pool(engine, 3, [text("SELECT VERSION()")])
+
+    assert opened == 3
+    assert pool.checkedout() == 0
+    assert pool.checkedin() >= max(before, 3)
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_closes_late_connections_when_one_fails():
+    """Test that a failed connect doesn't leak the connections other attempts open afterwards."""
+    closed = []
+
+    class FakeConnection:
+        async def execute(self, statement):
+            pass
+
+        async def close(self):
+            closed.append(self)
+
+    class FakeEngine:
+        calls = 0
+
+        async def connect(self):
+            self.calls += 1
+            if self.calls == 1:
+                raise OSError("connection refused")
+            await asyncio.sleep(0.01 * self.calls)
+            return FakeConnection()
+
+    with pytest.raises(OSError):
+        await warm_pool(FakeEngine(), 3, [])
+
+    assert len(closed) == 2
+
+
+@pytest.mark.asyncio
+async def test_zero_connections_disables_warm_up(monkeypatch):
+    """Test that DB_WARMUP_CONNECTIONS=0 (or DB_POOL_SIZE=0) marks the process ready without connecting."""
+    class NoEngine:
+        async def connect(self):
+            raise AssertionError("warm-up is disabled, nothing should connect")
+
+    state = Readiness()
+    monkeypatch.setattr(warmup, "readiness", state)
+
+    assert await warm_pool(NoEngine(), 0, [text("SELECT 1")]) == 0
+    await asyncio.wait_for(warm_up(NoEngine(), 0, logging.getLogger("test")), 1)
+    assert state.ready and state.error is None
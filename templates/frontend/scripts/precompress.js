@@ -0,0 +1,47 @@
+// Writes .gz and .br siblings for the compressible files in dist/, so server.js can serve
+// them as-is instead of compressing on every request.
+import { readdirSync, readFileSync, statSync, writeFileSync } from 'node:fs'
+import { extname, join } from 'node:path'
+import { fileURLToPath } from 'node:url'
+import { brotliCompressSync, constants, gzipSync } from 'node:zlib'
+
+const distDir = fileURLToPath(new URL('../dist', import.meta.url))
+const COMPRESSIBLE = new Set(['.html', '.js', '.mjs', '.css', '.json', '.svg', '.txt', '.xml', '.map', '.wasm'])
+const MIN_SIZE = 1024
+
+function* walk(dir) {
+  for (const entry of readdirSync(dir, { withFileTypes: true })) {
+    const path = join(dir, entry.name)
+    if (entry.isDirectory()) yield* walk(path)
+    else yield path
+  }
+}
+
+let original = 0
+let gzipped = 0
+let brotlied = 0
+
+for (const file of walk(distDir)) {
+  if (!COMPRESSIBLE.has(extname(file)) || statSync(file).size < MIN_SIZE) continue
+  const data = readFileSync(file)
+  const gz = gzipSync(data, { level: 9 })
+  const br = brotliCompressSync(data, {
+    params: {
+      [constants.BROTLI_PARAM_QUALITY]: constants.BROTLI_MAX_QUALITY,
+      [constants.BROTLI_PARAM_SIZE_HINT]: data.length
+    }
+  })
+  original += data.length
+  // Keep a variant only if it is actually smaller
+  if (gz.length < data.length) {
+    writeFileSync(file + '.gz', gz)
+    gzipped += gz.length
+  }
+  if (br.length < data.length) {
+    writeFileSync(file + '.br', br)
+    brotlied += br.length
+  }
+}
+
+const kb = (n) => (n / 1024).toFixed(1) + ' kB'
+console.log('precompressed ' + kb(original) + ' -> gzip ' + kb(gzipped) + ', brotli ' + kb(brotlied))
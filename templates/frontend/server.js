@@ -0,0 +1,146 @@
+// Production static server for dist/ (no dependencies).
+// - Serves the .br / .gz files written by scripts/precompress.js when the client accepts them
+// - Hashed files under /assets/ are cached forever; everything else is revalidated via ETag
+//   (one per encoding, so a cached .gz body is never confirmed for a br or identity request)
+// - Unknown paths without a file extension fall back to index.html (client-side routing)
+import { createServer } from 'node:http'
+import { createReadStream, readdirSync, statSync } from 'node:fs'
+import { extname, join, relative, sep } from 'node:path'
+import { fileURLToPath } from 'node:url'
+
+const root = fileURLToPath(new URL('./dist', import.meta.url))
+const port = Number(process.env.PORT || 8080)
+
+const TYPES = {
+  '.html': 'text/html; charset=utf-8',
+  '.js': 'text/javascript; charset=utf-8',
+  '.mjs': 'text/javascript; charset=utf-8',
+  '.css': 'text/css; charset=utf-8',
+  '.json': 'application/json; charset=utf-8',
+  '.map': 'application/json; charset=utf-8',
+  '.svg': 'image/svg+xml',
+  '.png': 'image/png',
+  '.jpg': 'image/jpeg',
+  '.jpeg': 'image/jpeg',
+  '.gif': 'image/gif',
+  '.webp': 'image/webp',
+  '.ico': 'image/x-icon',
+  '.txt': 'text/plain; charset=utf-8',
+  '.xml': 'application/xml',
+  '.wasm': 'application/wasm',
+  '.woff': 'font/woff',
+  '.woff2': 'font/woff2'
+}
+const IMMUTABLE = 'public, max-age=31536000, immutable'
+const REVALIDATE = 'no-cache'
+
+// dist/ doesn't change while the server runs, so index it once at startup
+function indexFiles(dir, files = new Map()) {
+  for (const entry of readdirSync(dir, { withFileTypes: true })) {
+    const path = join(dir, entry.name)
+    if (entry.isDirectory()) {
+      indexFiles(path, files)
+      continue
+    }
+    const ext = extname(entry.name)
+    if (ext === '.gz' || ext === '.br') continue
+    const stat = statSync(path)
+    const urlPath = '/' + relative(root, path).split(sep).join('/')
+    const tag = stat.size.toString(16) + '-' + Math.floor(stat.mtimeMs).toString(16)
+    const variant = (suffix, encoding) => {
+      try {
+        return { path: path + suffix, size: statSync(path + suffix).size, etag: '"' + tag + '-' + encoding + '"' }
+      } catch {
+        return null
+      }
+    }
+    files.set(urlPath, {
+      type: TYPES[ext] || 'application/octet-stream',
+      cacheControl: urlPath.startsWith('/assets/') ? IMMUTABLE : REVALIDATE,
+      identity: { path, size: stat.size, etag: '"' + tag + '"' },
+      br: variant('.br', 'br'),
+      gzip: variant('.gz', 'gz')
+    })
+  }
+  return files
+}
+
+const files = indexFiles(root)
+const indexHtml = files.get('/index.html')
+
+function accepts(header, encoding) {
+  return (header || '').split(',').some((part) => {
+    const [name, ...params] = part.trim().split(';')
+    const q = params.find((p) => p.trim().startsWith('q='))
+    return name.trim() === encoding && (!q || Number(q.trim().slice(2)) > 0)
+  })
+}
+
+function matches(ifNoneMatch, etag) {
+  return (ifNoneMatch || '').split(',').some((value) => value.trim().replace(/^W\//, '') === etag)
+}
+
+function lookup(pathname) {
+  let decoded
+  try {
+    decoded = decodeURIComponent(pathname)
+  } catch {
+    return null
+  }
+  // The index only holds files inside dist/, so "../" tricks simply don't match
+  const file = files.get(decoded === '/' ? '/index.html' : decoded)
+  if (file) return file
+  return extname(decoded) ? null : indexHtml
+}
+
+const server = createServer((req, res) => {
+  if (req.method !== 'GET' && req.method !== 'HEAD') {
+    res.writeHead(405, { Allow: 'GET, HEAD' }).end()
+    return
+  }
+
+  const file = lookup(new URL(req.url, 'http://localhost').pathname)
+  if (!file) {
+    res.writeHead(404, { 'Content-Type': 'text/plain; charset=utf-8' }).end('Not found')
+    return
+  }
+
+  const headers = {
+    'Content-Type': file.type,
+    'Cache-Control': file.cacheControl,
+    Vary: 'Accept-Encoding'
+  }
+  let body = file.identity
+  const acceptEncoding = req.headers['accept-encoding']
+  if (file.br && accepts(acceptEncoding, 'br')) {
+    body = file.br
+    headers['Content-Encoding'] = 'br'
+  } else if (file.gzip && accepts(acceptEncoding, 'gzip')) {
+    body = file.gzip
+    headers['Content-Encoding'] = 'gzip'
+  }
+  headers.ETag = body.etag
+
+  if (matches(req.headers['if-none-match'], body.etag)) {
+    res.writeHead(304, headers).end()
+    return
+  }
+  headers['Content-Length'] = body.size
+
+  res.writeHead(200, headers)
+  if (req.method === 'HEAD') {
+    res.end()
+    return
+  }
+  createReadStream(body.path)
+    .on('error', () => res.destroy())
+    .pipe(res)
+})
+
+server.listen(port, () => {
+  console.log('Serving ' + root + ' on port ' + port + ' (' + files.size + ' files)')
+})
+
+for (const signal of ['SIGINT', 'SIGTERM']) {
+  process.on(signal, () => server.close(() => process.exit(0)))
+}
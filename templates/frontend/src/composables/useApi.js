@@ -0,0 +1,45 @@
+import { onMounted, onUnmounted, ref } from 'vue'
+import { get, subscribe } from '../services/api'
+
+/**
+ * Reactive GET for components.
+ *
+ *   const { data, error, loading, refresh } = useApi('/api/dbversion', { ttl: 30000 })
+ *
+ * Shares in-flight requests and the cache with every other caller of the same path, picks up
+ * background revalidations, and aborts its request when the component unmounts. Options are
+ * passed to get() (ttl, staleTtl, batch); immediate: false skips the request on mount.
+ */
+export function useApi(path, options = {}) {
+  const { immediate = true, ...getOptions } = options
+  const data = ref(null)
+  const error = ref(null)
+  const loading = ref(false)
+  let controller = null
+
+  const unsubscribe = subscribe(path, (fresh) => {
+    data.value = fresh
+  })
+
+  async function refresh({ force = false } = {}) {
+    controller?.abort()
+    const current = (controller = new AbortController())
+    loading.value = true
+    error.value = null
+    try {
+      data.value = await get(path, { ...getOptions, force, signal: current.signal })
+    } catch (e) {
+      if (e.name !== 'AbortError') error.value = e.message
+    } finally {
+      if (controller === current) loading.value = false
+    }
+  }
+
+  if (immediate) onMounted(refresh)
+  onUnmounted(() => {
+    unsubscribe()
+    controller?.abort()
+  })
+
+  return { data, error, loading, refresh }
+}
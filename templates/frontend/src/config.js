@@ -3,6 +3,9 @@ const defaultBase = 'http://localhost:${API_PORT}'
 export const config = {
   apiBaseUrl: (typeof import.meta !== 'undefined' && import.meta.env && import.meta.env.VITE_API_BASE_URL)
     || (typeof window !== 'undefined' && window.API_BASE_URL)
-    || defaultBase
+    || defaultBase,
+  // get(path, { batch: true }) calls within this window share one POST /api/batch
+  batchWindowMs: 10,
+  batchMaxRequests: 20 // keep <= the backend's BATCH_MAX_REQUESTS
 }
 
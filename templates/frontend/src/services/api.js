@@ -29,6 +29,12 @@ function extractErrorMessage(text, status) {
   }
 }
 
+function httpError(text, status) {
+  const err = new Error(extractErrorMessage(text, status))
+  err.status = status
+  return err
+}
+
 async function request(path, options = {}) {
   const url = `${config.apiBaseUrl}${path}`
   const { headers: customHeaders, body, ...restOptions } = options
@@ -50,17 +56,183 @@ async function request(path, options = {}) {
   
   if (!res.ok) {
     const text = await res.text().catch(() => '')
-    const errorMessage = extractErrorMessage(text, res.status)
-    const err = new Error(errorMessage)
-    err.status = res.status
-    throw err
+    throw httpError(text, res.status)
   }
   
   const ct = res.headers.get('content-type') || ''
   return ct.includes('application/json') ? res.json() : res.text()
 }
 
-export async function getDatabaseVersion() {
-  return request('/api/dbversion')
+// --- Cached GETs ------------------------------------------------------------------------------
+// get() shares one request between all concurrent callers of the same path, serves cached data
+// while it is fresh (ttl) and, once stale, returns it immediately while revalidating in the
+// background (stale-while-revalidate). Subscribers see every fresh response.
+
+const cache = new Map() // path -> { data, freshUntil, staleUntil }
+const inflight = new Map() // path -> { promise, controller, refs, pinned }
+const listeners = new Map() // path -> Set of callbacks
+
+function abortError() {
+  return new DOMException('The request was aborted', 'AbortError')
+}
+
+function store(path, data, ttl, staleTtl) {
+  if (ttl > 0) {
+    const now = Date.now()
+    cache.set(path, { data, freshUntil: now + ttl, staleUntil: now + ttl + staleTtl })
+  }
+  listeners.get(path)?.forEach((fn) => fn(data))
+  return data
+}
+
+function fetchShared(path, { ttl, staleTtl, batch }) {
+  let entry = inflight.get(path)
+  if (entry) return entry
+
+  const controller = new AbortController()
+  const promise = (batch ? enqueueBatch(path) : request(path, { signal: controller.signal }))
+    .then((data) => store(path, data, ttl, staleTtl))
+    .finally(() => {
+      if (inflight.get(path) === entry) inflight.delete(path)
+    })
+  entry = { promise, controller, refs: 0, pinned: false }
+  inflight.set(path, entry)
+  return entry
+}
+
+// Each caller with a signal holds a reference: aborting rejects only that caller, and the shared
+// request itself is aborted once every caller has gone. Callers without a signal pin it.
+function join(entry, path, signal) {
+  if (!signal) {
+    entry.pinned = true
+    return entry.promise
+  }
+  if (signal.aborted) return Promise.reject(abortError())
+  entry.refs++
+  return new Promise((resolve, reject) => {
+    const onAbort = () => {
+      if (--entry.refs === 0 && !entry.pinned) {
+        if (inflight.get(path) === entry) inflight.delete(path)
+        entry.controller.abort()
+      }
+      reject(abortError())
+    }
+    signal.addEventListener('abort', onAbort, { once: true })
+    entry.promise
+      .then(resolve, reject)
+      .finally(() => signal.removeEventListener('abort', onAbort))
+  })
+}
+
+/**
+ * GET with deduplication and caching.
+ *
+ *   get('/api/dbversion', { ttl: 30000, signal })
+ *
+ * - ttl: ms the response is fresh (0 = not cached, concurrent calls are still shared)
+ * - staleTtl: ms after that during which stale data is returned while revalidating
+ * - signal: AbortSignal of this caller
+ * - batch: send through POST /api/batch together with other batched GETs of the same tick
+ * - force: skip the cache
+ */
+export function get(path, { ttl = 0, staleTtl = 5 * 60 * 1000, signal, batch = false, force = false } = {}) {
+  const options = { ttl, staleTtl, batch }
+  const cached = cache.get(path)
+  const now = Date.now()
+  if (cached && !force && now < cached.staleUntil) {
+    if (now >= cached.freshUntil) {
+      join(fetchShared(path, options), path).catch(() => {})
+    }
+    return Promise.resolve(cached.data)
+  }
+  return join(fetchShared(path, options), path, signal)
+}
+
+/** Call fn with every fresh response for path; returns the unsubscribe function. */
+export function subscribe(path, fn) {
+  if (!listeners.has(path)) listeners.set(path, new Set())
+  listeners.get(path).add(fn)
+  return () => {
+    const set = listeners.get(path)
+    set?.delete(fn)
+    if (set?.size === 0) listeners.delete(path)
+  }
+}
+
+/** Drop cached responses whose path starts with prefix (all of them without one), e.g. after a write. */
+export function invalidate(prefix = '') {
+  for (const path of cache.keys()) {
+    if (path.startsWith(prefix)) cache.delete(path)
+  }
+}
+
+// --- Batching -----------------------------------------------------------------------------------
+// Batched GETs issued within config.batchWindowMs go out as one POST /api/batch. They share that
+// request, so aborting one caller doesn't cancel it.
+
+let batchQueue = []
+let batchTimer = null
+
+function enqueueBatch(path) {
+  return new Promise((resolve, reject) => {
+    batchQueue.push({ path, resolve, reject })
+    if (batchQueue.length >= config.batchMaxRequests) {
+      flushBatch()
+    } else if (!batchTimer) {
+      batchTimer = setTimeout(flushBatch, config.batchWindowMs)
+    }
+  })
+}
+
+async function flushBatch() {
+  clearTimeout(batchTimer)
+  batchTimer = null
+  const items = batchQueue
+  batchQueue = []
+  if (items.length === 1) {
+    request(items[0].path).then(items[0].resolve, items[0].reject)
+    return
+  }
+  try {
+    const { responses } = await request('/api/batch', {
+      method: 'POST',
+      body: { requests: items.map(({ path }) => ({ path })) }
+    })
+    items.forEach((item, i) => {
+      const { status, body } = responses[i]
+      if (status >= 200 && status < 300) {
+        item.resolve(body)
+      } else {
+        item.reject(httpError(typeof body === 'string' ? body : JSON.stringify(body), status))
+      }
+    })
+  } catch (e) {
+    items.forEach((item) => item.reject(e))
+  }
+}
+
+export async function getDatabaseVersion(options = {}) {
+  return get('/api/dbversion', { ttl: 30000, ...options })
 }
 
+
+/**
+ * Iterate over every item of a cursor-paginated listing, fetching pages as needed:
+ *
+ *   for await (const job of paginate('/api/jobs', { limit: 100 })) { ... }
+ *
+ * Each page request sends the previous page's next_cursor, so deep pages cost the same as the first.
+ */
+export async function* paginate(path, params = {}) {
+  let cursor = null
+  do {
+    const query = new URLSearchParams({ ...params, ...(cursor ? { cursor } : {}) })
+    const page = await request(`${path}?${query}`)
+    yield* page.items
+    cursor = page.next_cursor
+  } while (cursor)
+}
+
+export async function listJobs(params = {}) {
+  return request(`/api/jobs?${new URLSearchParams(params)}`)
+}
@@ -7,6 +7,11 @@ export default defineConfig({
     host: '0.0.0.0',
     port: 5173,
     strictPort: true
+  },
+  build: {
+    // Content-hashed file names under /assets/ are served with immutable caching by server.js
+    assetsDir: 'assets',
+    // Compressed sizes are produced by scripts/precompress.js instead
+    reportCompressedSize: false
   }
 })
-
@@ -0,0 +1,133 @@
+#!/bin/bash
+# First-time setup for ${PROJECT_NAME}, with independent steps run concurrently.
+#
+#   1. volumes   - create all Docker volumes at once
+#   2. backend   - build the backend image and install Python dependencies   ┐
+#      frontend  - build the frontend image and install npm dependencies     ├ in parallel
+#      database  - start both MySQL containers and wait until they are healthy ┘
+#   3. services  - start everything else and wait on the health checks
+#   4. migrate   - run database migrations
+#
+# Output of each step goes to .setup-logs/<step>.log and a timing report is
+# printed at the end. Usually invoked through `make setup`.
+
+set -u
+
+LOG_DIR=.setup-logs
+rm -rf "$LOG_DIR"
+mkdir -p "$LOG_DIR"
+
+STEPS=()
+PIDS=()
+NAMES=()
+SETUP_START=$(date +%s)
+
+# start_step <name> <command...> - run a step in the background, recording its timing
+start_step() {
+    local name="$1"
+    shift
+    STEPS+=("$name")
+    echo "→ $name started"
+    (
+        start=$(date +%s)
+        if "$@" >"$LOG_DIR/$name.log" 2>&1; then status=ok; else status=failed; fi
+        echo "$start $(date +%s) $status" >"$LOG_DIR/$name.time"
+        echo "  $name finished ($status)"
+        [ "$status" = ok ]
+    ) &
+    PIDS+=("$!")
+    NAMES+=("$name")
+}
+
+# wait_steps - wait for all running steps; fail if any of them failed
+wait_steps() {
+    local failed=0
+    for i in "${!PIDS[@]}"; do
+        if ! wait "${PIDS[$i]}"; then
+            echo "✗ ${NAMES[$i]} failed, see $LOG_DIR/${NAMES[$i]}.log"
+            failed=1
+        fi
+    done
+    PIDS=()
+    NAMES=()
+    return $failed
+}
+
+report() {
+    echo ""
+    echo "Step timings:"
+    for name in "${STEPS[@]}"; do
+        if [ -f "$LOG_DIR/$name.time" ]; then
+            read -r start end status <"$LOG_DIR/$name.time"
+            printf "  %-10s %5ss  %s\n" "$name" "$((end - start))" "$status"
+        else
+            printf "  %-10s %6s  %s\n" "$name" "-" "not run"
+        fi
+    done
+    printf "  %-10s %5ss\n" "total" "$(($(date +%s) - SETUP_START))"
+}
+
+create_volume() {
+    if docker volume inspect "$1" >/dev/null 2>&1; then
+        echo "⚠ Warning: Volume $1 already exists (may contain old data)"
+        echo "   Run 'make clean-volumes' to remove volumes and start fresh"
+    else
+        docker volume create "$1"
+    fi
+}
+
+step_volumes() {
+    local failed=0
+    create_volume ${PROJECT_NAME}_dbdata &
+    create_volume ${PROJECT_NAME}_sitepack &
+    for job in $(jobs -p); do
+        wait "$job" || failed=1
+    done
+    return $failed
+}
+
+step_backend() {
+    docker compose build ${BACKEND_NAME} &&
+    docker compose run --rm --no-deps ${BACKEND_NAME} sh -c \
+        "python -m venv /home/appuser/venv 2>/dev/null || true && pip install --no-cache-dir --find-links=wheelhouse -r requirements.txt"
+}
+
+step_frontend() {
+    docker compose build ${FRONTEND_NAME} &&
+    docker compose run --rm --no-deps ${FRONTEND_NAME} npm install
+}
+
+step_database() {
+    docker compose up -d --wait ${BACKEND_NAME}-database ${BACKEND_NAME}-database-test
+}
+
+step_services() {
+    docker compose up -d --wait
+}
+
+step_migrate() {
+    docker compose exec -T ${BACKEND_NAME} alembic upgrade head
+}
+
+fail() {
+    report
+    echo ""
+    echo "✗ Setup failed."
+    exit 1
+}
+
+start_step volumes step_volumes
+wait_steps || fail
+
+start_step backend step_backend
+start_step frontend step_frontend
+start_step database step_database
+wait_steps || fail
+
+start_step services step_services
+wait_steps || fail
+
+start_step migrate step_migrate
+wait_steps || fail
+
+report